@@ -18,10 +18,12 @@ from platform import machine as osprocessor
 from platform import system
 import sys
 
+from argparse import ArgumentParser
 from configparser import ConfigParser
 from pathlib import Path
 
 from json import load as jsonload
+from json import dump as jsondump
 from random import choice
 from locale import LC_ALL, getdefaultlocale, getlocale, setlocale
 
@@ -29,17 +31,25 @@ from re import sub
 from socket import socket
 from datetime import datetime
 from statistics import mean
-from signal import SIGINT, signal
-from collections import deque
-from time import ctime, sleep, strptime, time
+from signal import SIG_IGN, SIGINT, signal
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager, nullcontext
+from inspect import signature
+from time import ctime, perf_counter, sleep, strptime, time
 import pip
 
 from subprocess import DEVNULL, Popen, check_call, call
-from threading import Thread
+from threading import Thread, current_thread, enumerate as threads, get_ident
 from threading import Lock as thread_lock
 from threading import Semaphore
+from queue import Empty, Full, Queue
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 import base64 as b64
+from hashlib import sha1
 
 import os
 import random
@@ -117,6 +127,43 @@ class Settings:
     ENCODING = "utf-8"
     I2C_WR_RDDCY = 2
     WORKER_CFG_SHARED = "y"
+    VERIFY_SHARES = "n"
+    HOST_WORKERS = 0
+    HOST_CPU_BUDGET = 100  # percent of a core per host worker
+    HOST_DIFFICULTY = "LOW"
+    HOST_IDENTIFIER = "None"
+    RECORD_FILE = "None"
+    DIFFICULTY_CLASS = "AUTO"
+    I2C_BUS_BUDGET = 2000  # bytes/s shared by all I2C workers
+    TARGET_SHARE_RATE = 1.0  # shares/s per I2C worker
+    NONCE_SPLIT_GROUPS = "None"
+    JOB_QUEUE = "n"
+    I2C_FEC = "n"
+    QUARANTINE_FAILURES = 3  # consecutive failed jobs, 0 = never
+    QUARANTINE_BACKOFF = 5  # seconds before the first health probe
+    QUARANTINE_BACKOFF_MAX = 300
+    I2C_LOCKUP_TIME = 10  # seconds without a good transfer, 0 = off
+    I2C_BUS_CLEAR_CMD = "None"
+    HOTPLUG_SCAN = 0  # seconds between bus scans, 0 = off
+    HOTPLUG_RANGE = "None"  # hex addresses/ranges, None = configured workers
+    POLL_INTERVAL = 0.05  # seconds between result polls of a busy worker
+    SHUTDOWN_TIMEOUT = 15  # seconds to finish in-flight shares on Ctrl+C
+    FLIGHT_RECORDER = 64  # I2C transfers kept per worker
+    CONTROL_SOCKET = "None"
+    CONSOLE_MODE = "lines"  # or "dashboard"
+    SHARE_SAMPLING = 1  # print every Nth share line
+    DASHBOARD_REFRESH = 2  # seconds between dashboard redraws
+    LOG_LEVELS = "None"  # e.g. "bus=debug,net=info"
+    LOG_FILE = "None"
+    LOG_FILE_SIZE = 5  # MB before the log file rotates
+    LOG_FILE_BACKUPS = 3
+    SHARE_LOG = "None"
+    SHARE_LOG_SIZE = 10  # MB before the share log rotates
+    SHARE_LOG_BACKUPS = 5
+    SHARE_LOG_FLUSH = 5  # seconds between batched writes
+    TRACE_FILE = "None"
+    TRACE_EVENTS = 50000  # spans kept for the trace export
+    STATE_FILE = "state.json"
     disable_title = False
     try:
         # Raspberry Pi latin users can't display this character
@@ -226,6 +273,8 @@ class Client:
     Class helping to organize socket connections
     """
     def connect(pool: tuple):
+        if replay:
+            return replay.connect()
         s = socket()
         s.settimeout(Settings.SOC_TIMEOUT)
         s.connect((pool))
@@ -240,6 +289,8 @@ class Client:
         return data
 
     def fetch_pool():
+        if replay:
+            return ("replay", 0)
         while True:
             pretty_print("net0", " " + get_string("connection_search"),
                          "info")
@@ -255,7 +306,7 @@ class Client:
                                  
                     NODE_ADDRESS = response["ip"]
                     NODE_PORT = response["port"]
-                    debug_output(f"Fetched pool: {response['name']}")
+                    log_net.debug("Fetched pool: %s", response['name'])
                     return (NODE_ADDRESS, NODE_PORT)
                     
                 elif "message" in response:
@@ -345,7 +396,7 @@ class Donate:
 shares = [0, 0, 0]
 bad_crc8 = 0
 i2c_retry_count = 0
-hashrate_mean = deque(maxlen=25)
+compute_errors = 0
 ping_mean = deque(maxlen=25)
 diff = 0
 shuffle_ports = "y"
@@ -359,6 +410,19 @@ hashrate = 0
 config = ConfigParser()
 mining_start_time = time()
 worker_cfg_global = {"valid":False}
+# [worker <name>] sections of Settings.cfg by address
+worker_inventory = {}
+# avrport as listed in Settings.cfg, without hot-plugged workers
+configured_ports = []
+reload_lock = thread_lock()
+# set on the first Ctrl+C, no new jobs are taken
+stopping = False
+# (com, lane) of every running mining_loop
+mining_lanes = set()
+# MOTD of the pool, shown with the periodic report
+pool_motd = None
+# state.json of the last clean shutdown
+saved_state = {}
 
 if not path.exists(Settings.DATA_DIR):
     mkdir(Settings.DATA_DIR)
@@ -466,11 +530,60 @@ def get_prefix(symbol: str,
     return val + symbol
 
 
+# one logger per subsystem, log_levels sets them apart from debug
+log = logging.getLogger("miner")
+log_bus = logging.getLogger("miner.bus")
+log_net = logging.getLogger("miner.net")
+log_worker = logging.getLogger("miner.worker")
+log_listener = None
+
 def debug_output(text: str):
-    if debug == 'y':
-        print(Style.RESET_ALL + Fore.WHITE
-              + now().strftime(Style.DIM + '%H:%M:%S.%f ')
-              + Style.NORMAL + f'DEBUG: {text}')
+    log.debug(text)
+
+
+class ConsoleHandler(logging.Handler):
+    """
+    Log records through the printer thread, in the
+    format debug_output always had
+    """
+    def emit(self, record):
+        console(Style.RESET_ALL + Fore.WHITE
+                + datetime.fromtimestamp(record.created).strftime(
+                    Style.DIM + '%H:%M:%S.%f ')
+                + Style.NORMAL + f'{record.levelname}: {self.format(record)}')
+
+
+def setup_logging():
+    """
+    Levels from debug and log_levels. Records go to the console,
+    or with log_file to a rotating file written by a listener
+    thread, so no mining thread waits on the disk
+    """
+    global log_listener
+    log.setLevel(logging.DEBUG if debug == "y" else logging.WARNING)
+    log.propagate = False
+    if Settings.LOG_LEVELS != "None":
+        for item in Settings.LOG_LEVELS.split(","):
+            try:
+                name, level = item.split("=")
+                logging.getLogger("miner." + name).setLevel(level.upper())
+            except ValueError:
+                pretty_print("sys0", f" log_levels: can not use {item},"
+                             + " expected <bus|net|worker>=<level>", "warning")
+
+    if Settings.LOG_FILE == "None":
+        log.addHandler(ConsoleHandler())
+        return
+    handler = RotatingFileHandler(
+        path.join(Settings.DATA_DIR, Settings.LOG_FILE),
+        maxBytes=Settings.LOG_FILE_SIZE * 1024 * 1024,
+        backupCount=Settings.LOG_FILE_BACKUPS, encoding=Settings.ENCODING)
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(name)s %(levelname)s %(message)s"))
+    records = Queue()
+    log_listener = QueueListener(records, handler)
+    log_listener.start()
+    log.addHandler(QueueHandler(records))
 
 def ondemand_print(text: str):
     print(Style.RESET_ALL + Fore.WHITE
@@ -501,14 +614,93 @@ def title(title: str):
 
 
 def handler(signal_received, frame):
+    global stopping
+    if stopping or not mining_lanes:
+        # second Ctrl+C or nothing to drain
+        if share_log:
+            share_log.flush()
+        if tracer:
+            tracer.export()
+        pretty_print(
+            'sys0', get_string('sigint_detected')
+            + Style.NORMAL + Fore.RESET
+            + get_string('goodbye'), 'warning')
+        console_flush()
+        _exit(0)
+
+    stopping = True
+    pretty_print('sys0', f' Finishing {len(mining_lanes)} in-flight job(s),'
+                 + ' press Ctrl+C again to quit now', 'warning')
+    Thread(target=shutdown).start()
+
+
+def shutdown():
+    """
+    Graceful exit: wait up to shutdown_timeout for the jobs in
+    flight to be submitted, abort what is left, close the pool
+    sockets and save the state so the next start skips the
+    flush of the workers left idle
+    """
+    deadline = time() + Settings.SHUTDOWN_TIMEOUT
+    while mining_lanes and time() < deadline:
+        sleep(0.1)
+
+    busy = {com for com, lane in list(mining_lanes)}
+    state = {"time": time(), "shares": shares, "idle": [], "workers": {}}
+    for worker in list(workers.values()):
+        if worker.kind != "i2c":
+            continue
+        if worker.com in busy or (worker.group and worker.group.com in busy):
+            if not (worker.abort_en
+                    and set_worker_abort(i2c_bus, worker.com) == "ok"):
+                # the result still comes, the next start flushes it
+                continue
+        state["idle"].append(worker.com)
+        state["workers"][worker.com] = {
+            "avr_timeout": worker.avr_timeout,
+            "wr_rddcy": worker.wr_rddcy,
+            "job_diff": worker.job_diff,
+            "hashrate": worker.hashrate,
+            "difficulty_class": worker.difficulty_class}
+    if busy:
+        pretty_print('sys0', f' Gave up on {", ".join(sorted(busy))} after'
+                     + f' {Settings.SHUTDOWN_TIMEOUT}s', 'warning')
+    if share_log:
+        share_log.flush()
+    if tracer:
+        tracer.export()
+
+    try:
+        with open(path.join(Settings.DATA_DIR, Settings.STATE_FILE),
+                  "w", encoding=Settings.ENCODING) as f:
+            jsondump(state, f)
+    except Exception as e:
+        debug_output(f'Error saving state: {e}')
+
     pretty_print(
         'sys0', get_string('sigint_detected')
         + Style.NORMAL + Fore.RESET
         + get_string('goodbye'), 'warning')
-
+    console_flush()
     _exit(0)
 
 
+def load_state():
+    """
+    Read and remove the state of the last shutdown, a crash
+    before the next clean shutdown leaves no state behind
+    """
+    filename = path.join(Settings.DATA_DIR, Settings.STATE_FILE)
+    try:
+        with open(filename, encoding=Settings.ENCODING) as f:
+            saved_state.update(jsonload(f))
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        debug_output(f'Error loading state: {e}')
+
+
 # Enable signal handler
 signal(SIGINT, handler)
 
@@ -646,7 +838,42 @@ def load_config():
             "mining_key":       mining_key,
             "i2c":              i2c,
             "i2c_wr_rddcy":     Settings.I2C_WR_RDDCY,
-            "worker_cfg_shared":Settings.WORKER_CFG_SHARED}
+            "worker_cfg_shared":Settings.WORKER_CFG_SHARED,
+            "verify_shares":    Settings.VERIFY_SHARES,
+            "host_workers":     Settings.HOST_WORKERS,
+            "host_cpu_budget":  Settings.HOST_CPU_BUDGET,
+            "host_difficulty":  Settings.HOST_DIFFICULTY,
+            "host_identifier":  Settings.HOST_IDENTIFIER,
+            "record_file":      Settings.RECORD_FILE,
+            "difficulty_class": Settings.DIFFICULTY_CLASS,
+            "i2c_bus_budget":   Settings.I2C_BUS_BUDGET,
+            "target_share_rate":Settings.TARGET_SHARE_RATE,
+            "nonce_split_groups":Settings.NONCE_SPLIT_GROUPS,
+            "job_queue":        Settings.JOB_QUEUE,
+            "i2c_fec":          Settings.I2C_FEC,
+            "quarantine_failures":Settings.QUARANTINE_FAILURES,
+            "quarantine_backoff_max":Settings.QUARANTINE_BACKOFF_MAX,
+            "i2c_lockup_time":  Settings.I2C_LOCKUP_TIME,
+            "i2c_bus_clear_cmd":Settings.I2C_BUS_CLEAR_CMD,
+            "hotplug_scan":     Settings.HOTPLUG_SCAN,
+            "hotplug_range":    Settings.HOTPLUG_RANGE,
+            "poll_interval":    Settings.POLL_INTERVAL,
+            "shutdown_timeout": Settings.SHUTDOWN_TIMEOUT,
+            "control_socket":   Settings.CONTROL_SOCKET,
+            "console_mode":     Settings.CONSOLE_MODE,
+            "share_sampling":   Settings.SHARE_SAMPLING,
+            "dashboard_refresh":Settings.DASHBOARD_REFRESH,
+            "log_levels":       Settings.LOG_LEVELS,
+            "log_file":         Settings.LOG_FILE,
+            "log_file_size":    Settings.LOG_FILE_SIZE,
+            "log_file_backups": Settings.LOG_FILE_BACKUPS,
+            "share_log":        Settings.SHARE_LOG,
+            "share_log_size":   Settings.SHARE_LOG_SIZE,
+            "share_log_backups":Settings.SHARE_LOG_BACKUPS,
+            "share_log_flush":  Settings.SHARE_LOG_FLUSH,
+            "trace_file":       Settings.TRACE_FILE,
+            "trace_events":     Settings.TRACE_EVENTS,
+            "flight_recorder":  Settings.FLIGHT_RECORDER}
 
         with open(str(Settings.DATA_DIR)
                   + '/Settings.cfg', 'w') as configfile:
@@ -676,6 +903,280 @@ def load_config():
         i2c = int(config["AVR Miner"]["i2c"])
         Settings.I2C_WR_RDDCY = int(config["AVR Miner"]["i2c_wr_rddcy"])
         Settings.WORKER_CFG_SHARED = config["AVR Miner"]["worker_cfg_shared"].lower()
+        Settings.VERIFY_SHARES = config["AVR Miner"].get(
+            "verify_shares", Settings.VERIFY_SHARES).lower()
+        Settings.HOST_WORKERS = int(config["AVR Miner"].get(
+            "host_workers", Settings.HOST_WORKERS))
+        Settings.HOST_CPU_BUDGET = min(100, max(1, int(config["AVR Miner"].get(
+            "host_cpu_budget", Settings.HOST_CPU_BUDGET))))
+        Settings.HOST_DIFFICULTY = config["AVR Miner"].get(
+            "host_difficulty", Settings.HOST_DIFFICULTY).upper()
+        Settings.HOST_IDENTIFIER = config["AVR Miner"].get(
+            "host_identifier", Settings.HOST_IDENTIFIER)
+        Settings.RECORD_FILE = config["AVR Miner"].get(
+            "record_file", Settings.RECORD_FILE)
+        Settings.DIFFICULTY_CLASS = config["AVR Miner"].get(
+            "difficulty_class", Settings.DIFFICULTY_CLASS).upper()
+        Settings.I2C_BUS_BUDGET = int(config["AVR Miner"].get(
+            "i2c_bus_budget", Settings.I2C_BUS_BUDGET))
+        Settings.TARGET_SHARE_RATE = float(config["AVR Miner"].get(
+            "target_share_rate", Settings.TARGET_SHARE_RATE))
+        Settings.NONCE_SPLIT_GROUPS = config["AVR Miner"].get(
+            "nonce_split_groups", Settings.NONCE_SPLIT_GROUPS).replace(" ", "")
+        Settings.JOB_QUEUE = config["AVR Miner"].get(
+            "job_queue", Settings.JOB_QUEUE).lower()
+        Settings.I2C_FEC = config["AVR Miner"].get(
+            "i2c_fec", Settings.I2C_FEC).lower()
+        Settings.QUARANTINE_FAILURES = int(config["AVR Miner"].get(
+            "quarantine_failures", Settings.QUARANTINE_FAILURES))
+        Settings.QUARANTINE_BACKOFF_MAX = int(config["AVR Miner"].get(
+            "quarantine_backoff_max", Settings.QUARANTINE_BACKOFF_MAX))
+        Settings.I2C_LOCKUP_TIME = int(config["AVR Miner"].get(
+            "i2c_lockup_time", Settings.I2C_LOCKUP_TIME))
+        Settings.I2C_BUS_CLEAR_CMD = config["AVR Miner"].get(
+            "i2c_bus_clear_cmd", Settings.I2C_BUS_CLEAR_CMD)
+        Settings.HOTPLUG_SCAN = int(config["AVR Miner"].get(
+            "hotplug_scan", Settings.HOTPLUG_SCAN))
+        Settings.HOTPLUG_RANGE = config["AVR Miner"].get(
+            "hotplug_range", Settings.HOTPLUG_RANGE)
+        Settings.POLL_INTERVAL = float(config["AVR Miner"].get(
+            "poll_interval", Settings.POLL_INTERVAL))
+        Settings.SHUTDOWN_TIMEOUT = int(config["AVR Miner"].get(
+            "shutdown_timeout", Settings.SHUTDOWN_TIMEOUT))
+        Settings.CONTROL_SOCKET = config["AVR Miner"].get(
+            "control_socket", Settings.CONTROL_SOCKET)
+        Settings.CONSOLE_MODE = config["AVR Miner"].get(
+            "console_mode", Settings.CONSOLE_MODE).lower()
+        Settings.SHARE_SAMPLING = max(1, int(config["AVR Miner"].get(
+            "share_sampling", Settings.SHARE_SAMPLING)))
+        Settings.DASHBOARD_REFRESH = float(config["AVR Miner"].get(
+            "dashboard_refresh", Settings.DASHBOARD_REFRESH))
+        Settings.LOG_LEVELS = config["AVR Miner"].get(
+            "log_levels", Settings.LOG_LEVELS).replace(" ", "")
+        Settings.LOG_FILE = config["AVR Miner"].get(
+            "log_file", Settings.LOG_FILE)
+        Settings.LOG_FILE_SIZE = int(config["AVR Miner"].get(
+            "log_file_size", Settings.LOG_FILE_SIZE))
+        Settings.LOG_FILE_BACKUPS = int(config["AVR Miner"].get(
+            "log_file_backups", Settings.LOG_FILE_BACKUPS))
+        Settings.SHARE_LOG = config["AVR Miner"].get(
+            "share_log", Settings.SHARE_LOG)
+        Settings.SHARE_LOG_SIZE = int(config["AVR Miner"].get(
+            "share_log_size", Settings.SHARE_LOG_SIZE))
+        Settings.SHARE_LOG_BACKUPS = int(config["AVR Miner"].get(
+            "share_log_backups", Settings.SHARE_LOG_BACKUPS))
+        Settings.SHARE_LOG_FLUSH = float(config["AVR Miner"].get(
+            "share_log_flush", Settings.SHARE_LOG_FLUSH))
+        Settings.TRACE_FILE = config["AVR Miner"].get(
+            "trace_file", Settings.TRACE_FILE)
+        Settings.TRACE_EVENTS = int(config["AVR Miner"].get(
+            "trace_events", Settings.TRACE_EVENTS))
+        Settings.FLIGHT_RECORDER = int(config["AVR Miner"].get(
+            "flight_recorder", Settings.FLIGHT_RECORDER))
+
+        try:
+            inventory, ports = load_worker_inventory(config)
+        except ValueError as e:
+            print(Style.RESET_ALL + Fore.RED
+                  + f'Settings.cfg {e}. Exiting..')
+            _exit(1)
+        worker_inventory.update(inventory)
+        if ports:
+            # the [worker] sections replace avrport and identifier
+            avrport = ports
+            rig_identifier = [worker_inventory[com].get("identifier", "None")
+                              for com in ports]
+            hashrate_list = [0] * len(avrport)
+
+    configured_ports[:] = avrport
+
+
+# keys of a [worker <name>] section and their types
+WORKER_KEYS = {
+    "bus":              int,
+    "address":          str,
+    "identifier":       str,
+    "type":             str,
+    "avr_timeout":      float,
+    "i2c_wr_rddcy":     int,
+    "poll_interval":    float,
+    "difficulty_class": str,
+    "duinoiot_en":      str,
+}
+
+def load_worker_inventory(config):
+    """
+    Load and check the [worker <name>] sections of config.
+    Returns the sections by address and the addresses in file
+    order, none for the legacy avrport/identifier format.
+    Raises ValueError naming the section at fault
+    """
+    inventory = {}
+    ports = []
+    for section in config.sections():
+        if not section.lower().startswith("worker"):
+            continue
+        entry = {}
+        try:
+            for key, value in config[section].items():
+                if key not in WORKER_KEYS:
+                    raise ValueError(f"unknown key {key}")
+                entry[key] = WORKER_KEYS[key](value.strip())
+            if "address" not in entry:
+                raise ValueError("address is missing")
+            addr = int(entry.pop("address"), 16)
+            if not 0x08 <= addr <= 0x77:
+                raise ValueError(f"address {addr:02x} is not in 08-77")
+            com = format(addr, "x")
+            if com in inventory:
+                raise ValueError(f"address {addr:02x} is already used")
+            if entry.setdefault("bus", i2c) != i2c:
+                raise ValueError(f"bus {entry['bus']} is not i2c = {i2c},"
+                                 + " run one miner per bus")
+            if entry.get("avr_timeout", 1) <= 0 \
+                    or entry.get("poll_interval", 1) <= 0 \
+                    or entry.get("i2c_wr_rddcy", 1) < 1:
+                raise ValueError("avr_timeout, poll_interval and"
+                                 + " i2c_wr_rddcy must be positive")
+            if "difficulty_class" in entry:
+                entry["difficulty_class"] = entry["difficulty_class"].upper()
+                if entry["difficulty_class"] not in \
+                        ["AUTO"] + [t for t, _ in DIFFICULTY_TIERS]:
+                    raise ValueError("unknown difficulty_class "
+                                     + entry["difficulty_class"])
+            if "duinoiot_en" in entry:
+                entry["duinoiot_en"] = entry["duinoiot_en"].lower()
+            if "type" in entry:
+                entry["type"] = entry["type"].lower()
+        except ValueError as e:
+            raise ValueError(f"[{section}]: {e}")
+        inventory[com] = entry
+        ports.append(com)
+    return inventory, ports
+
+
+# Settings.cfg keys applied by reload_config, the rest needs a restart
+LIVE_SETTINGS = {
+    "soc_timeout":      ("SOC_TIMEOUT", int),
+    "avr_timeout":      ("AVR_TIMEOUT", float),
+    "delay_start":      ("DELAY_START", int),
+    "duinoiot_en":      ("IoT_EN", str.lower),
+    "periodic_report":  ("REPORT_TIME", int),
+    "i2c_wr_rddcy":     ("I2C_WR_RDDCY", int),
+    "verify_shares":    ("VERIFY_SHARES", str.lower),
+    "difficulty_class": ("DIFFICULTY_CLASS", str.upper),
+    "i2c_bus_budget":   ("I2C_BUS_BUDGET", int),
+    "target_share_rate":("TARGET_SHARE_RATE", float),
+    "quarantine_failures":("QUARANTINE_FAILURES", int),
+    "quarantine_backoff_max":("QUARANTINE_BACKOFF_MAX", int),
+    "i2c_lockup_time":  ("I2C_LOCKUP_TIME", int),
+    "i2c_bus_clear_cmd":("I2C_BUS_CLEAR_CMD", str),
+    "poll_interval":    ("POLL_INTERVAL", float),
+    "shutdown_timeout": ("SHUTDOWN_TIMEOUT", int),
+    "console_mode":     ("CONSOLE_MODE", str.lower),
+    "share_sampling":   ("SHARE_SAMPLING", lambda n: max(1, int(n))),
+    "dashboard_refresh":("DASHBOARD_REFRESH", float),
+}
+
+def reload_config():
+    """
+    Re-read Settings.cfg and apply what changed: global settings,
+    [worker] overrides and added or removed workers. Workers that
+    are not affected keep mining
+    """
+    global config
+    with reload_lock:
+        new_config = ConfigParser()
+        try:
+            new_config.read(str(Settings.DATA_DIR) + '/Settings.cfg')
+            miner = new_config["AVR Miner"]
+            settings = {}
+            for key, (name, cast) in LIVE_SETTINGS.items():
+                if key in miner:
+                    settings[name] = cast(miner[key].strip())
+            inventory, ports = load_worker_inventory(new_config)
+            if ports:
+                identifiers = [inventory[com].get("identifier", "None")
+                               for com in ports]
+            else:
+                ports = miner["avrport"].replace(" ", "").split(",")
+                identifiers = miner["identifier"].split(",")
+            identifiers = dict(zip(ports, identifiers))
+        except (KeyError, ValueError) as e:
+            pretty_print("sys0", f" Settings.cfg not reloaded: {e}", "error")
+            return
+
+        old = config["AVR Miner"]
+        restart = sorted(key for key in set(miner) | set(old)
+                         if key not in LIVE_SETTINGS
+                         and key not in ("avrport", "identifier")
+                         and miner.get(key) != old.get(key))
+        changed = [key for key, (name, _) in LIVE_SETTINGS.items()
+                   if name in settings and settings[name] != getattr(Settings, name)]
+        for name, value in settings.items():
+            setattr(Settings, name, value)
+        worker_inventory.clear()
+        worker_inventory.update(inventory)
+        config = new_config
+        pretty_print("sys0", " Settings.cfg reloaded"
+                     + (f", changed {', '.join(changed)}" if changed else ""),
+                     "success")
+        if restart:
+            pretty_print("sys0", f" {', '.join(restart)} will change at the"
+                         + " next restart", "warning")
+
+        addresses = [int(com, 16) for com in ports]
+        for com in configured_ports:
+            worker = workers.get(com)
+            if (int(com, 16) in addresses or worker is None
+                    or worker.kind != "i2c"):
+                continue
+            if worker.group:
+                pretty_print("sys" + worker.port, " worker is in a nonce split"
+                             + " group, restart to remove it", "warning")
+                continue
+            retire_worker(worker, "removed from Settings.cfg")
+
+        running = [int(com, 16) for com in avrport]
+        for com in ports:
+            if int(com, 16) not in running:
+                pretty_print("sys" + port_num(com),
+                             f" worker 0x{port_num(com)} added, starting it",
+                             "success")
+                start_worker(com, fastest_pool, identifiers.get(com, "None"))
+        configured_ports[:] = ports
+
+        for worker in list(workers.values()):
+            if worker.kind != "i2c" or worker.retired:
+                continue
+            updated = worker.configure(
+                worker_inventory.get(format(int(worker.com, 16), "x"), {}))
+            if worker.name and not worker.check_type(worker.name):
+                retire_worker(worker, "is not the configured type")
+                continue
+            identifier = identifiers.get(worker.com, worker.rig_identifier)
+            if identifier != worker.rig_identifier:
+                # sent with the next login
+                worker.rig_identifier = identifier
+                updated.append("identifier")
+            iot_en = worker.sensor_en and worker.cfg.get(
+                "duinoiot_en", Settings.IoT_EN) == "y"
+            if iot_en != worker.iot_en:
+                worker.iot_en = iot_en
+                updated.append("duinoiot_en")
+            difficulty_class = worker.difficulty_class
+            worker.select_difficulty()
+            if difficulty_class != worker.difficulty_class:
+                updated.append("difficulty_class")
+            if updated:
+                pretty_print("sys" + worker.port,
+                             f" reloaded {', '.join(updated)}", "success")
+
+
+def reload_handler(signal_received, frame):
+    # reload outside the handler, the interrupted thread may
+    # hold a lock the reload needs
+    Thread(target=reload_config).start()
 
 
 def greeting():
@@ -818,26 +1319,20 @@ def pretty_print(sender: str = "sys0",
     else:
         fg_color = Fore.YELLOW
 
-    with thread_lock():
-        printlock.acquire()
-        print(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
-              + bg_color + Style.BRIGHT + " " + sender + " "
-              + Back.RESET + " " + fg_color + msg.strip())
-        printlock.release()
+    console(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
+            + bg_color + Style.BRIGHT + " " + sender + " "
+            + Back.RESET + " " + fg_color + msg.strip())
 
 def worker_print(com, **kwargs):
 
     text = ""
     for key in kwargs:
         text += "%s %s . " % (key, kwargs.get(key))
-    with thread_lock():
-        printlock.acquire()
-        print(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
-              + Fore.WHITE + Style.BRIGHT + Back.MAGENTA + Fore.RESET
-              + " avr" + port_num(com) + " " + Back.RESET + " "
-              + "worker capability report -> "
-              + text)
-        printlock.release()
+    console(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
+            + Fore.WHITE + Style.BRIGHT + Back.MAGENTA + Fore.RESET
+            + " avr" + port_num(com) + " " + Back.RESET + " "
+            + "worker capability report -> "
+            + text)
 
 def share_print(id, type, accept, reject, thread_hashrate,
                 total_hashrate, computetime, diff, ping, reject_cause=None, iot_data=None):
@@ -845,6 +1340,12 @@ def share_print(id, type, accept, reject, thread_hashrate,
     Produces nicely formatted CLI output for shares:
     HH:MM:S |avrN| ⛏ Accepted 0/0 (100%) ∙ 0.0s ∙ 0 kH/s ⚙ diff 0 k ∙ ping 0ms
     """
+    if Settings.CONSOLE_MODE == "dashboard":
+        return
+    if type == "accept" and (accept + reject) % Settings.SHARE_SAMPLING:
+        # rejects and blocks always show
+        return
+
     try:
         thread_hashrate = get_prefix("H/s", thread_hashrate, 2)
     except:
@@ -872,72 +1373,496 @@ def share_print(id, type, accept, reject, thread_hashrate,
         (temperature, humidity) = iot_data.split("@")
         iot_text = f"{temperature}° . "
 
-    with thread_lock():
-        printlock.acquire()
-        print(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
-              + Style.RESET_ALL + Fore.WHITE + Style.BRIGHT + Back.MAGENTA
-              + " avr" + str(id) + " " + Style.RESET_ALL + fg_color 
-              + Settings.PICK + share_str + Fore.RESET
-              + str(accept) + "/" + str(accept + reject) + Fore.MAGENTA
-              + " (" + str(round(accept / (accept + reject) * 100)) + "%)"
-              + Style.NORMAL + Fore.RESET
-              + " ∙ " + str("%04.1f" % float(computetime)) + "s"
-              + Style.NORMAL + " ∙ " + Fore.BLUE + Style.BRIGHT
-              + f"{thread_hashrate}" + Style.DIM
-              + f" ({total_hashrate} {get_string('hashrate_total')})" + Fore.RESET + Style.NORMAL
-              + Settings.COG + f" {get_string('diff')} {diff} ∙ "
-              + f"{iot_text}" + Fore.CYAN
-              + f"ping {(int(ping))}ms")
-        printlock.release()
+    console(Fore.WHITE + datetime.now().strftime(Style.DIM + "%H:%M:%S ")
+            + Style.RESET_ALL + Fore.WHITE + Style.BRIGHT + Back.MAGENTA
+            + " " + str(id) + " " + Style.RESET_ALL + fg_color 
+            + Settings.PICK + share_str + Fore.RESET
+            + str(accept) + "/" + str(accept + reject) + Fore.MAGENTA
+            + " (" + str(round(accept / (accept + reject) * 100)) + "%)"
+            + Style.NORMAL + Fore.RESET
+            + " ∙ " + str("%04.1f" % float(computetime)) + "s"
+            + Style.NORMAL + " ∙ " + Fore.BLUE + Style.BRIGHT
+            + f"{thread_hashrate}" + Style.DIM
+            + f" ({total_hashrate} {get_string('hashrate_total')})" + Fore.RESET + Style.NORMAL
+            + Settings.COG + f" {get_string('diff')} {diff} ∙ "
+            + f"{iot_text}" + Fore.CYAN
+            + f"ping {(int(ping))}ms")
+
+
+# lines for the printer thread, a full queue drops lines
+# rather than hold up a mining thread
+console_queue = Queue(maxsize=1000)
+console_started = False
+console_dropped = 0
+# latest window title, set by the printer thread
+console_title = None
+
+def console(text):
+    """
+    Print text from the printer thread once it runs,
+    right here before that
+    """
+    global console_dropped
+    if not console_started:
+        with thread_lock():
+            printlock.acquire()
+            print(text)
+            printlock.release()
+        return
+    try:
+        console_queue.put_nowait(text)
+    except Full:
+        console_dropped += 1
+
+
+def set_title(text):
+    global console_title
+    if console_started:
+        console_title = text
+    else:
+        title(text)
+
+
+def start_console():
+    global console_started
+    console_started = True
+    Thread(target=console_printer, daemon=True).start()
+
+
+def console_printer():
+    """
+    Printer thread: the only one writing to stdout once started.
+    Prints the queued lines, or keeps the last of them under a
+    worker table redrawn every dashboard_refresh seconds
+    """
+    recent = deque(maxlen=8)
+    last_title = None
+    last_draw = 0
+    while True:
+        try:
+            text = console_queue.get(timeout=0.25)
+        except Empty:
+            text = None
+        dashboard = Settings.CONSOLE_MODE == "dashboard"
+        if text is not None:
+            if dashboard:
+                recent.append(text)
+            else:
+                print(text)
+            console_queue.task_done()
+        if console_title != last_title and console_queue.empty():
+            # at most once per batch, it runs a process on Windows
+            last_title = console_title
+            title(last_title)
+        if dashboard and time() - last_draw >= Settings.DASHBOARD_REFRESH:
+            last_draw = time()
+            try:
+                print(dashboard_text(recent))
+            except Exception as e:
+                recent.append(f"dashboard error: {e}")
+
+
+def console_flush(timeout=2):
+    # let the printer and log threads catch up before the process exits
+    if log_listener:
+        log_listener.stop()
+    deadline = time() + timeout
+    while console_started and not console_queue.empty() and time() < deadline:
+        sleep(0.05)
+    sleep(0.1 if console_started else 0)
+
+
+def dashboard_text(recent):
+    rows = [("worker", "state", "hashrate", "accepted", "rejected",
+             "difficulty", "last share")]
+    for w in sorted(list(workers.values()), key=lambda w: w.label):
+        if w.retired or getattr(w, "group", None):
+            continue
+        last = (f"{int(time() - w.transactions[-1][0])}s ago"
+                if w.transactions else "-")
+        rows.append((w.label, "paused" if w.paused else w.state,
+                     get_prefix("H/s", w.hashrate, 2), str(w.accepted),
+                     str(w.rejected), w.difficulty_class, last))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    table = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+             for row in rows]
+    accepted, rejected, blocks = shares
+    return ("\033[2J\033[H" + Style.BRIGHT + Fore.YELLOW
+            + f"Duino-Coin RPI I2C AVR Miner {Settings.VER}" + Style.RESET_ALL
+            + f"   up {calculate_uptime(mining_start_time)}"
+            + f"   {get_prefix('H/s', hashrate, 2)}"
+            + f"   {accepted}/{accepted + rejected} accepted"
+            + f"   {blocks} blocks\n\n"
+            + Style.BRIGHT + table[0] + Style.RESET_ALL + "\n"
+            + "\n".join(table[1:]) + "\n\n"
+            + "\n".join(recent)
+            + (f"\n{console_dropped} lines dropped" if console_dropped else ""))
+
+# EREMOTEIO, ETIMEDOUT, EIO: what a stuck bus looks like to smbus,
+# EBADF: the handle a failed recovery could not reopen
+I2C_LOCKUP_ERRNOS = (121, 110, 5, 9)
+# get,freq of workers that did not answer it, I2C standard mode
+I2C_DEFAULT_FREQ = 100000
+
+
+class I2CStats:
+    """
+    Bus usage of one worker address: data bytes and transfers,
+    seconds holding i2clock and flushing, errors by class
+    (errno <n>, nak, crc, timeout, parse). Wire time is what the
+    transfers take at the worker's get,freq clock: 9 clocks per
+    byte (8 bits and ack) including the address byte, plus start
+    and stop
+    """
+    FIELDS = ("written", "read", "transactions", "lock_time", "flush_time")
+
+    def __init__(self, freq=0):
+        self.freq = freq
+        self.written = 0
+        self.read = 0
+        self.transactions = 0
+        self.lock_time = 0.0
+        self.flush_time = 0.0
+        self.errors = Counter()
+        # set on sums of several addresses, each at its own clock
+        self.wire = None
+
+    def __sub__(self, other):
+        diff = I2CStats(self.freq)
+        for field in self.FIELDS:
+            setattr(diff, field, getattr(self, field) - getattr(other, field))
+        diff.errors = self.errors - other.errors
+        return diff
+
+    def __add__(self, other):
+        total = I2CStats()
+        for field in self.FIELDS:
+            setattr(total, field, getattr(self, field) + getattr(other, field))
+        total.errors = self.errors + other.errors
+        total.wire = self.wire_time() + other.wire_time()
+        return total
+
+    def wire_time(self):
+        if self.wire is not None:
+            return self.wire
+        clocks = (self.written + self.read + self.transactions) * 9
+        return (clocks + self.transactions * 2) / (self.freq or I2C_DEFAULT_FREQ)
+
+    def summary(self, seconds):
+        seconds = max(seconds, 1)
+        errors = ", ".join(f"{error} {count}"
+                           for error, count in self.errors.most_common())
+        return (f"{self.lock_time / seconds * 100:.1f}% held,"
+                + f" {self.wire_time() / seconds * 100:.1f}% on the wire,"
+                + f" {self.flush_time / seconds * 100:.1f}% flushing,"
+                + f" {self.written / seconds:.0f} B/s out,"
+                + f" {self.read / seconds:.0f} B/s in,"
+                + f" {self.transactions / seconds:.0f} transfers/s"
+                + (f", errors: {errors}" if errors else ""))
+
+
+class FlightRecorder:
+    """
+    The last flight_recorder transfers of one worker address as
+    (time, direction, data, repeat): W for a frame written, R for
+    the bytes read up to a newline, ! for an error. A run of idle
+    polls is one entry with its repeat count, so the ring keeps
+    the frames around a failure. Called with i2clock held
+    """
+    DUMP_INTERVAL = 60  # seconds between automatic dumps
+
+    def __init__(self, size):
+        self.entries = deque(maxlen=size)
+        self.reading = bytearray()
+        self.read_time = 0
+        # idle polls since the last entry
+        self.idle = 0
+        self.idle_time = 0
+        self.last_dump = 0
+
+    def write(self, data):
+        self._append(time(), "W", data)
+
+    def read(self, byte):
+        if not self.reading:
+            if byte == 10:
+                if not self.idle:
+                    self.idle_time = time()
+                self.idle += 1
+                return
+            self.read_time = time()
+        self.reading.append(byte)
+        if byte == 10:
+            self._append(self.read_time, "R", self.reading.decode("latin-1"))
+
+    def error(self, error):
+        self._append(time(), "!", error)
+
+    def _append(self, t, direction, data):
+        if self.reading and direction != "R":
+            # answer cut short
+            self._append(self.read_time, "R", self.reading.decode("latin-1"))
+        self.reading.clear()
+        if self.idle:
+            self.entries.append((self.idle_time, "R", "\n", self.idle))
+            self.idle = 0
+        self.entries.append((t, direction, data, 1))
+
+    def lines(self):
+        return [datetime.fromtimestamp(t).strftime("%H:%M:%S.%f")[:-3]
+                + f" {direction} {data!r}" + (f" x{repeat}" if repeat > 1 else "")
+                for t, direction, data, repeat in list(self.entries)
+                + ([(self.idle_time, "R", "\n", self.idle)] if self.idle else [])]
+
+    def dump(self, label, reason, force=False):
+        """
+        Write the ring to flight_<label>_<time>.log in the data
+        folder, at most every DUMP_INTERVAL unless forced. Returns
+        the file name or None
+        """
+        if not force and time() - self.last_dump < self.DUMP_INTERVAL:
+            return None
+        self.last_dump = time()
+        filename = path.join(
+            Settings.DATA_DIR,
+            f"flight_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+        with open(filename, "w", encoding=Settings.ENCODING) as f:
+            f.write(f"{label}: {reason}\n" + "\n".join(self.lines()) + "\n")
+        return filename
+
+
+class I2CBus:
+    """
+    SMBus with bus lockup recovery. When no transfer has gone
+    through for i2c_lockup_time seconds while several addresses
+    keep failing, the handle is closed, i2c_bus_clear_cmd runs
+    (e.g. a script toggling SCL or power cycling the workers),
+    the bus is reopened and the workers are probed. Transfers
+    are called with i2clock held, so mining pauses meanwhile
+    """
+
+    def __init__(self, bus_num):
+        self.bus_num = bus_num
+        self.bus = SMBus(bus_num)
+        self.last_ok = time()
+        self.failing = set()
+        self.errors = 0
+        self.recovery_attempts = 0
+        self.recoveries = 0
+        self.next_recovery = 0
+        # I2CStats by address, and their values at the last report
+        self.stats = {}
+        self.reported = {}
+        self.started = time()
+        # FlightRecorder by address
+        self.flights = {}
+
+    def usage(self, addr):
+        stats = self.stats.get(addr)
+        if stats is None:
+            stats = self.stats[addr] = I2CStats()
+        return stats
+
+    def flight(self, addr):
+        recorder = self.flights.get(addr)
+        if recorder is None:
+            recorder = self.flights[addr] = FlightRecorder(
+                Settings.FLIGHT_RECORDER)
+        return recorder
+
+    def write_byte(self, addr, value):
+        self._transfer(addr, self.bus.write_byte, addr, value)
+        self.usage(addr).written += 1
+
+    def write_i2c_block_data(self, addr, reg, data):
+        self._transfer(addr, self.bus.write_i2c_block_data,
+                       addr, reg, data)
+        self.usage(addr).written += 1 + len(data)
+
+    def read_byte(self, addr):
+        result = self._transfer(addr, self.bus.read_byte, addr)
+        self.usage(addr).read += 1
+        self.flight(addr).read(result)
+        return result
+
+    def present(self, addr):
+        """
+        Address ack through a quick write, workers ignore the empty
+        message. Not counted toward lockup detection
+        """
+        try:
+            self.bus.write_quick(addr)
+            return True
+        except OSError:
+            return False
+
+    def _transfer(self, addr, fn, *args):
+        self.usage(addr).transactions += 1
+        try:
+            result = fn(*args)
+        except OSError as e:
+            self.usage(addr).errors[f"errno {e.errno}"] += 1
+            self.flight(addr).error(f"errno {e.errno} {e.strerror}")
+            self._failed(addr, e)
+            raise
+        self.last_ok = time()
+        self.failing.clear()
+        return result
+
+    def _failed(self, addr, e):
+        self.errors += 1
+        if not Settings.I2C_LOCKUP_TIME or e.errno not in I2C_LOCKUP_ERRNOS:
+            return
+        self.failing.add(addr)
+        now = time()
+        # one dead worker is the supervisor's business, not a bus lockup
+        if (now - self.last_ok > Settings.I2C_LOCKUP_TIME
+                and len(self.failing) >= min(2, len(avrport))
+                and now >= self.next_recovery):
+            with trace("recovery", "bus", bus=self.bus_num):
+                self.recover()
+
+    def report(self, seconds):
+        """
+        Usage of the bus and of each address since the last report
+        """
+        period = {}
+        for addr, stats in list(self.stats.items()):
+            period[addr] = stats - self.reported.get(addr, I2CStats())
+            self.reported[addr] = stats - I2CStats()
+        return self.usage_lines(period, seconds)
+
+    def usage_lines(self, stats, seconds):
+        if not stats:
+            return []
+        total = I2CStats()
+        for usage in stats.values():
+            total = total + usage
+        lines = [f"I2C Bus {self.bus_num}: {total.summary(seconds)}"]
+        for addr, usage in sorted(stats.items()):
+            if usage.transactions:
+                lines.append(f"  avr{port_num(format(addr, 'x'))}"
+                             + f" @{(usage.freq or I2C_DEFAULT_FREQ) // 1000} kHz:"
+                             + f" {usage.summary(seconds)}")
+        return lines
+
+    def recover(self):
+        self.recovery_attempts += 1
+        pretty_print("sys0", f" I2C bus {self.bus_num} locked up"
+                     + f" ({len(self.failing)} workers failing), recovery"
+                     + f" attempt {self.recovery_attempts}", "warning")
+        try:
+            self.bus.close()
+        except Exception as e:
+            log_bus.debug("Error closing I2C bus: %s", e)
+        if Settings.I2C_BUS_CLEAR_CMD != "None":
+            try:
+                status = call(Settings.I2C_BUS_CLEAR_CMD, shell=True,
+                              timeout=60)
+                log_bus.debug("i2c_bus_clear_cmd exited with %s", status)
+            except Exception as e:
+                log_bus.debug("Error running i2c_bus_clear_cmd: %s", e)
+        try:
+            self.bus = SMBus(self.bus_num)
+        except Exception as e:
+            # transfers on the closed handle fail with EBADF, which
+            # brings the next recovery attempt
+            log_bus.warning("Error reopening I2C bus: %s", e)
+
+        alive = 0
+        for com in avrport:
+            try:
+                self.bus.read_byte(int(com, base=16))
+                alive += 1
+            except Exception:
+                pass
+        if alive:
+            self.recoveries += 1
+            self.last_ok = time()
+            self.failing.clear()
+            self.next_recovery = 0
+            pretty_print("sys0", f" I2C bus {self.bus_num} recovered,"
+                         + f" {alive}/{len(avrport)} workers answering",
+                         "success")
+        else:
+            # try again later, backing off up to 32 lockup periods
+            failed = self.recovery_attempts - self.recoveries
+            self.next_recovery = time() + (Settings.I2C_LOCKUP_TIME
+                                           * 2 ** min(failed, 5))
+            pretty_print("sys0", f" I2C bus {self.bus_num} still not"
+                         + " answering, check wiring and power", "error")
+
 
 def flush_i2c(i2c_bus,com,period=1):
     i2c_flush_start = time()
-    with thread_lock():
+    with thread_lock(), trace("flush", "bus", worker=com):
         while True:
             i2c_read(i2c_bus, com)
         
             if (time() - i2c_flush_start) > period:
                 break
+    i2c_bus.usage(int(com, base=16)).flush_time += time() - i2c_flush_start
+
+def i2clock_acquire(com):
+    # on the timeline only when another thread holds the bus
+    if not i2clock.acquire(blocking=False):
+        with trace("i2clock wait", "bus", worker=com):
+            i2clock.acquire()
 
 def i2c_write(i2c_bus, com, i2c_data, wr_rddcy=-1):
 
     if wr_rddcy == -1:
         wr_rddcy = Settings.I2C_WR_RDDCY
-    debug_output(com + f': i2c_wdata=[{i2c_data}]')
+    log_bus.debug("%s: i2c_wdata=[%s]", com, i2c_data)
     
     with thread_lock():
         try:
-            i2clock.acquire()
-            for i in range(0, len(i2c_data)):
-                if wr_rddcy == 1:
-                    # write single byte i2c data
-                    i2c_bus.write_byte(int(com, base=16), 
-                                       ord(i2c_data[i]))
-                elif wr_rddcy > 1:
-                    # write repeated i2c data
-                    # help the i2cs to get the msg
-                    i2c_bus.write_i2c_block_data(int(com, base=16),
-                                                 ord(i2c_data[i]),
-                                                 [ord(i2c_data[i])]*(wr_rddcy-1))
-                sleep(0.0002)
+            i2clock_acquire(com)
+            held = perf_counter()
+            i2c_bus.flight(int(com, base=16)).write(i2c_data)
+            with trace("write", "bus", worker=com, bytes=len(i2c_data)):
+                for i in range(0, len(i2c_data)):
+                    if wr_rddcy == 1:
+                        # write single byte i2c data
+                        i2c_bus.write_byte(int(com, base=16), 
+                                           ord(i2c_data[i]))
+                    elif wr_rddcy > 1:
+                        # write repeated i2c data
+                        # help the i2cs to get the msg
+                        i2c_bus.write_i2c_block_data(int(com, base=16),
+                                                     ord(i2c_data[i]),
+                                                     [ord(i2c_data[i])]*(wr_rddcy-1))
+                    sleep(0.0002)
         except Exception as e:
-            debug_output(com + f': {e}')
+            log_bus.debug("%s: %s", com, e)
             pass
         finally:
+            held = perf_counter() - held
             i2clock.release()
+        i2c_bus.usage(int(com, base=16)).lock_time += held
 
 def i2c_read(i2c_bus, com):
     
-    i2c_rdata = ""
+    i2c_rdata = i2c_read_byte(i2c_bus, com)
+    if i2c_rdata < 0:
+        return ""
+    return chr(i2c_rdata)
+
+def i2c_read_byte(i2c_bus, com):
+    # raw byte value, -1 when the read failed
+    i2c_rdata = -1
     with thread_lock():
         try:
-            i2clock.acquire()
-            i2c_rdata = chr(i2c_bus.read_byte(int(com, base=16)))
+            i2clock_acquire(com)
+            held = perf_counter()
+            i2c_rdata = i2c_bus.read_byte(int(com, base=16))
         except Exception as e:
-            debug_output(com + f': {e}')
+            log_bus.debug("%s: %s", com, e)
             pass
         finally:
+            held = perf_counter() - held
             i2clock.release()
+        i2c_bus.usage(int(com, base=16)).lock_time += held
 
     return i2c_rdata
 
@@ -946,25 +1871,26 @@ def get_temperature(i2c_bus,com):
     i2c_resp = "0.00"
     start_time = time()
 
-    try:
-        i2c_write(i2c_bus, com, i2c_cmd)
+    with trace("get,temp", "probe", worker=com):
+        try:
+            i2c_write(i2c_bus, com, i2c_cmd)
 
-        i2c_resp = ""
-        while True:
-            i2c_rdata = i2c_read(i2c_bus, com)
+            i2c_resp = ""
+            while True:
+                i2c_rdata = i2c_read(i2c_bus, com)
 
-            if (i2c_rdata.isalnum() or ('.' in i2c_rdata)):
-                i2c_resp += i2c_rdata.strip()
+                if (i2c_rdata.isalnum() or ('.' in i2c_rdata)):
+                    i2c_resp += i2c_rdata.strip()
 
-            if ('\n' in i2c_rdata) and (len(i2c_resp)>0):
-                break
+                if ('\n' in i2c_rdata) and (len(i2c_resp)>0):
+                    break
 
-            if (time() - start_time) > 1:
-                i2c_resp = "0.00"
-                break
-    except Exception as e:
-        debug_output(com + f': {e}')
-        pass
+                if (time() - start_time) > 1:
+                    i2c_resp = "0.00"
+                    break
+        except Exception as e:
+            log_bus.debug("%s: %s", com, e)
+            pass
 
     #debug_output(com + f': i2c_resp:[{i2c_resp}]')
     return i2c_resp
@@ -981,26 +1907,27 @@ def get_worker_i2cfreq(i2c_bus,com):
 def send_worker_cmd(i2c_bus,com,cmd,default):
     i2c_resp = default
     start_time = time()
-    try:
-        i2c_write(i2c_bus, com, cmd)
+    with trace(cmd.rstrip("$"), "probe", worker=com):
+        try:
+            i2c_write(i2c_bus, com, cmd)
 
-        i2c_resp = ""
-        while True:
-            i2c_rdata = i2c_read(i2c_bus, com)
+            i2c_resp = ""
+            while True:
+                i2c_rdata = i2c_read(i2c_bus, com)
 
-            if (i2c_rdata.isalnum()):
-                i2c_resp += i2c_rdata.strip()
+                if (i2c_rdata.isalnum()):
+                    i2c_resp += i2c_rdata.strip()
 
-            if ('\n' in i2c_rdata) and (len(i2c_resp)>0):
-                break
+                if ('\n' in i2c_rdata) and (len(i2c_resp)>0):
+                    break
 
-            # shouldn't take more than 1s to get response
-            if (time() - start_time) > 1:
-                i2c_resp = "0"
-                break
-    except Exception as e:
-        debug_output(com + f': {e}')
-        pass
+                # shouldn't take more than 1s to get response
+                if (time() - start_time) > 1:
+                    i2c_resp = "0"
+                    break
+        except Exception as e:
+            log_bus.debug("%s: %s", com, e)
+            pass
 
     #debug_output(com + f': i2c_resp:[{i2c_resp}]')
     try:
@@ -1034,27 +1961,1555 @@ def get_worker_name(i2c_bus,com):
 
     return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
 
-def crc8(data):
+def get_worker_abort_status(i2c_bus,com):
+    i2c_cmd = "get,abort$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def set_worker_abort(i2c_bus,com):
+    i2c_cmd = "set,abort$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def get_worker_range_status(i2c_bus,com):
+    i2c_cmd = "get,range$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def get_worker_queue_status(i2c_bus,com):
+    i2c_cmd = "get,queue$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def get_worker_resend_status(i2c_bus,com):
+    i2c_cmd = "get,xmit$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def get_worker_fec_status(i2c_bus,com):
+    i2c_cmd = "get,ecc$"
+    default_answer = "0"
+
+    return send_worker_cmd(i2c_bus,com,i2c_cmd,default_answer)
+
+def _crc8_bitwise(byte):
     crc = 0
-    for i in range(len(data)):
-        byte = data[i]
-        for b in range(8):
-            fb_bit = (crc ^ byte) & 0x01
-            if fb_bit == 0x01:
-                crc = crc ^ 0x18
-            crc = (crc >> 1) & 0x7f
-            if fb_bit == 0x01:
-                crc = crc | 0x80
-            byte = byte >> 1
+    for b in range(8):
+        fb_bit = (crc ^ byte) & 0x01
+        if fb_bit == 0x01:
+            crc = crc ^ 0x18
+        crc = (crc >> 1) & 0x7f
+        if fb_bit == 0x01:
+            crc = crc | 0x80
+        byte = byte >> 1
+    return crc
+
+# Dallas/Maxim CRC8 (reflected 0x31) lookup, one entry per input byte
+CRC8_TABLE = bytes(_crc8_bitwise(i) for i in range(256))
+
+
+def crc8(data, crc=0):
+    """
+    Table driven CRC8 over bytes-like data. Pass the previous
+    value in crc to continue a checksum across chunks
+    """
+    table = CRC8_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
     return crc
 
-def is_subscript(c):
-    if c.isdigit():
+
+def crc8_many(frames):
+    """
+    CRC8 for a batch of frames in one call
+    """
+    return [crc8(frame) for frame in frames]
+
+
+class CRC8:
+    """
+    Streaming CRC8. update() with bytes as they arrive,
+    read the running checksum from value
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, data=b""):
+        self.value = crc8(data)
+
+    def update(self, data):
+        self.value = crc8(data, self.value)
+        return self
+
+    def update_byte(self, byte):
+        self.value = CRC8_TABLE[self.value ^ byte]
+        return self
+
+    def reset(self):
+        self.value = 0
+        return self
+
+
+# even parity of each byte value
+_PARITY = bytes(bin(_b).count("1") & 1 for _b in range(256))
+
+
+def fec_encode(frame):
+    """
+    Single-bit forward error correction for a job line without
+    its newline: ~<frame>*<lrc>. Bit 7 of every character
+    carries even parity and finds the flipped byte, the XOR of
+    all frame characters (lrc, 2 hex digits) finds the bit
+    """
+    lrc = 0
+    for c in frame:
+        lrc ^= ord(c)
+    frame = "~" + frame + "*" + format(lrc, "02x")
+    return "".join(chr(ord(c) | _PARITY[ord(c)] << 7) for c in frame)
+
+
+def fec_start(byte):
+    """
+    True for the first byte of a FEC frame, a ~ with at
+    most one flipped bit
+    """
+    flipped = (byte & 0x7f) ^ ord("~")
+    return not flipped & (flipped - 1)
+
+
+def fec_decode(frame):
+    """
+    Inverse of fec_encode for bytes off the bus. Returns the
+    frame and the number of corrected bits, raises ValueError
+    when it cannot be corrected
+    """
+    if len(frame) < 4 or not fec_start(frame[0]):
+        raise ValueError("not a FEC frame")
+    data = bytearray(b & 0x7f for b in frame)
+    # by position, the * may be the flipped byte
+    star = len(frame) - 3
+    bad = [i for i in range(1, star) if _PARITY[frame[i]]]
+    if not bad:
+        # an error in the lrc itself does not matter
+        return bytes(data[1:star]), 0
+    if len(bad) > 1:
+        raise ValueError("more than one corrupted byte")
+    syndrome = int(data[star + 1:], 16)
+    for b in data[1:star]:
+        syndrome ^= b
+    if syndrome & (syndrome - 1):
+        raise ValueError("more than one flipped bit")
+    # a zero syndrome means the parity bit itself flipped
+    data[bad[0]] ^= syndrome
+    return bytes(data[1:star]), 1
+
+
+WorkerResult = namedtuple("WorkerResult", "nonce elapsed ducoid crc seq")
+
+# byte classes used by ResponseParser.feed
+_RESP_SKIP, _RESP_DATA, _RESP_SEP, _RESP_END, _RESP_NAK, _RESP_CMD = range(6)
+_RESP_CLASS = bytearray(256)  # _RESP_SKIP
+for _c in b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz":
+    _RESP_CLASS[_c] = _RESP_DATA
+for _c in range(0xB0, 0xBA):
+    # rare incident where MSB bit flipped on a digit
+    _RESP_CLASS[_c] = _RESP_DATA
+_RESP_CLASS[ord(",")] = _RESP_SEP
+_RESP_CLASS[ord("\n")] = _RESP_END
+_RESP_CLASS[ord("#")] = _RESP_NAK
+_RESP_CLASS[ord("$")] = _RESP_CMD
+del _c
+
+
+class ResponseParser:
+    """
+    Incremental parser for worker result frames
+    nonce,elapsed,DUCOID[,i<seq>][,crc8]\\n
+    Bytes are consumed as they come off the bus into a
+    preallocated buffer, feed() returns a WorkerResult once the
+    frame is complete, ResponseParser.NAK when the worker
+    asked for the job again or ResponseParser.BAD for a
+    garbled frame
+    """
+    NAK = "#"
+    BAD = "?"
+
+    def __init__(self, crc8_en=True, size=128):
+        self.buf = bytearray(size)
+        self.size = size
+        self.crc8_en = crc8_en
+        self.seps = []
+        # bits corrected by FEC, on either end of the bus
+        self.corrected = 0
+        # bus bytes of the last complete frame, newline included,
+        # kept after reset()
+        self.frame_length = 0
+        self.reset()
+
+    def reset(self):
+        self.length = 0
+        del self.seps[:]
+        self.crc = 0
+        # CRC8 of the payload up to and including the last separator
+        self.payload_crc = 0
+
+    def feed(self, byte):
+        if byte < 0:
+            return None
+        cls = _RESP_CLASS[byte]
+        if cls == _RESP_DATA:
+            byte &= 0x7f
+        elif cls == _RESP_SEP:
+            self.seps.append(self.length)
+        elif cls == _RESP_END:
+            return self._complete()
+        elif cls == _RESP_NAK:
+            return self.NAK
+        elif cls == _RESP_CMD:
+            # worker cmd overflow into response area. dump it
+            self.reset()
+            return None
+        else:
+            return None
+
+        if self.length == self.size:
+            # no valid frame is this long, start over
+            self.reset()
+            return None
+        self.buf[self.length] = byte
+        self.length += 1
+        self.crc = CRC8_TABLE[self.crc ^ byte]
+        if cls == _RESP_SEP:
+            self.payload_crc = self.crc
+        return None
+
+    def feed_block(self, data):
+        for byte in data:
+            result = self.feed(byte)
+            if result is not None:
+                return result
+        return None
+
+    def _complete(self):
+        if not self.length:
+            # idle worker
+            return None
+        try:
+            result = self._fields()
+            self.frame_length = self.length + 1
+            return result
+        except ValueError:
+            pass
+        self.reset()
+        return self.BAD
+
+    def _fields(self):
+        seps = self.seps
+        fields = len(seps) + 1
+        if fields < (4 if self.crc8_en else 3):
+            raise ValueError("missing fields")
+        if seps[-1] == self.length - 1 and self.crc8_en:
+            raise ValueError("missing crc8")
+        buf = self.buf
+        ends = seps + [self.length]
+        nonce = int(buf[:seps[0]])
+        elapsed = int(buf[seps[0] + 1:seps[1]])
+        ducoid = buf[seps[1] + 1:ends[2]].decode()
+        crc = None
+        if self.crc8_en:
+            fields -= 1
+            crc = int(buf[seps[-1] + 1:self.length])
+        seq = None
+        for i in range(3, fields):
+            # tagged fields between DUCOID and crc8
+            tag = buf[seps[i - 1] + 1]
+            if tag == ord("i"):
+                seq = int(buf[seps[i - 1] + 2:ends[i]])
+            elif tag == ord("e"):
+                # the worker corrected its job line
+                self.corrected += int(buf[seps[i - 1] + 2:ends[i]])
+        return WorkerResult(nonce, elapsed, ducoid, crc, seq)
+
+
+class FecResponseParser(ResponseParser):
+    """
+    ResponseParser for workers with get,ecc. Results arrive as
+    fec_encode frames and are corrected before parsing, NAKs
+    and command replies stay plain
+    """
+
+    def __init__(self, crc8_en=True, size=128):
+        self.raw = bytearray()
+        super().__init__(crc8_en, size)
+
+    def reset(self):
+        super().reset()
+        del self.raw[:]
+
+    def feed(self, byte):
+        if byte < 0:
+            return None
+        if not self.raw and not fec_start(byte):
+            return super().feed(byte)
+        if byte != 10:
+            if len(self.raw) == self.size:
+                self.reset()
+                return None
+            self.raw.append(byte)
+            # callers check length to see if a frame is coming in
+            self.length = len(self.raw)
+            return None
+
+        raw = bytes(self.raw)
+        self.reset()
         try:
-            int(c)
+            frame, corrected = fec_decode(raw)
         except ValueError:
+            return self.BAD
+        self.corrected += corrected
+        for byte in frame:
+            super().feed(byte)
+        result = super().feed(10)
+        # the encoded frame is what crossed the bus
+        self.frame_length = len(raw) + 1
+        return result
+
+def ducos1_verify(last_hash, expected_hash, nonce):
+    return sha1((last_hash + str(nonce)).encode()).hexdigest() == expected_hash
+
+def ducos1_recover(last_hash, expected_hash, nonce, max_nonce):
+    """
+    Search the nonces one digit away from a result that failed
+    verification (substituted, dropped or doubled digit).
+    Returns the corrected nonce or None
+    """
+    base = sha1(last_hash.encode())
+    target = bytes.fromhex(expected_hash)
+    digits = str(nonce)
+    candidates = set()
+    for pos in range(len(digits) + 1):
+        for d in "0123456789":
+            candidates.add(digits[:pos] + d + digits[pos:])
+            if pos < len(digits):
+                candidates.add(digits[:pos] + d + digits[pos + 1:])
+        if pos < len(digits):
+            candidates.add(digits[:pos] + digits[pos + 1:])
+    candidates.discard(digits)
+    for candidate in candidates:
+        if (not candidate or (candidate[0] == "0" and len(candidate) > 1)
+                or int(candidate) > max_nonce):
+            continue
+        h = base.copy()
+        h.update(candidate.encode())
+        if h.digest() == target:
+            return int(candidate)
+    return None
+
+
+def ducos1_search(last_hash, expected_hash, difficulty, cpu_budget=100):
+    """
+    DUCO-S1 on the host CPU, runs inside a host pool process.
+    The SHA1 state of last_hash is computed once and copied for
+    every nonce. cpu_budget (percent) throttles the process by
+    sleeping in proportion to the time spent hashing.
+    Returns (nonce, elapsed microseconds)
+    """
+    start_time = time()
+    base = sha1(last_hash.encode())
+    target = bytes.fromhex(expected_hash)
+    slice_start = start_time
+    for nonce in range(difficulty * 100 + 1):
+        h = base.copy()
+        h.update(str(nonce).encode())
+        if h.digest() == target:
+            return nonce, int((time() - start_time) * 1000000)
+        if cpu_budget < 100 and not nonce % 10000:
+            busy = time() - slice_start
+            sleep(busy * (100 - cpu_budget) / cpu_budget)
+            slice_start = time()
+    return 0, int((time() - start_time) * 1000000)
+
+# pool difficulty tiers an I2C worker may request, lowest first,
+# with their approximate starting difficulty. The pool scales the
+# difficulty per worker from there, see I2CWorker.select_difficulty
+DIFFICULTY_TIERS = (("AVR", 6), ("MEGA", 16), ("ARM", 48))
+# get,name answers of workers too fast for the AVR tier
+FAST_WORKER_NAMES = ("rp2040",)
+
+def host_pool_init():
+    # Ctrl+C is the parent's, it drains the host jobs in flight
+    signal(SIGINT, SIG_IGN)
+    # hashing processes always yield to the bus-servicing threads
+    try:
+        os.nice(19)
+    except (AttributeError, OSError):
+        pass
+
+
+class Worker:
+    """
+    Per-worker state shared between the mining thread
+    and the reporting code. Subclasses implement
+    mine_job(job), returning a WorkerResult or None on failure
+    """
+    kind = None
+    miner_name = "RPI I2C AVR Miner"
+
+    def __init__(self, com, threadid, rig_identifier):
+        self.com = com
+        self.threadid = threadid
+        self.rig_identifier = rig_identifier
+        self.port = com
+        self.label = com
+        self.difficulty_class = "AVR"
+        self.name = ""
+        self.iot_en = False
+        self.ducoid = ""
+        self.hashrate = 0
+        self.hashrate_mean = deque(maxlen=25)
+        self.compute_errors = 0
+        self.recovered_nonces = 0
+        # health: "ok" or "quarantine"
+        self.state = "ok"
+        self.failures = 0
+        self.quarantines = 0
+        self.probes = 0
+        self.next_probe = 0
+        self.health_lock = thread_lock()
+        # set by the hot-plug scanner when the worker is unplugged
+        self.retired = False
+        # control socket: hold before the next job, quarantine at it
+        self.paused = False
+        self.quarantine_requested = False
+        self.busy = 0
+        self.accepted = 0
+        self.rejected = 0
+        # retries of the last job
+        self.retries = 0
+        # crc8 mismatches over the worker's life
+        self.bad_crc8 = 0
+        # (time, diff, nonce, elapsed us, wall ms, feedback) of recent jobs
+        self.transactions = deque(maxlen=50)
+
+    def flush(self, period=1):
+        pass
+
+    def abort(self):
+        """
+        Drop the job in progress, the worker takes
+        the next job right away
+        """
+        self.flush()
+
+    def select_difficulty(self):
+        pass
+
+    @property
+    def fec_corrected(self):
+        return 0
+
+    def dump_flight(self, reason, force=False):
+        return None
+
+    def job_result(self, ok):
+        """
+        Count consecutive failed jobs. Returns True when the
+        worker has failed often enough to go to quarantine
+        """
+        with self.health_lock:
+            if ok:
+                self.failures = 0
+                return False
+            self.failures += 1
+            return (Settings.QUARANTINE_FAILURES > 0
+                    and self.failures >= Settings.QUARANTINE_FAILURES)
+
+    def probe(self):
+        """
+        Health check for a quarantined worker
+        """
+        return True
+
+    def quarantine(self):
+        """
+        Keep the worker off the bus until probe() succeeds,
+        waiting twice as long after every failed probe. Other
+        threads of the same worker block here as well
+        """
+        with self.health_lock:
+            if (not self.quarantine_requested
+                    and self.failures < max(Settings.QUARANTINE_FAILURES, 1)):
+                # another lane brought the worker back meanwhile
+                return
+            self.quarantine_requested = False
+            self.state = "quarantine"
+            self.quarantines += 1
+            self.dump_flight("quarantine")
+            pretty_print("sys" + self.port,
+                         f" {self.label} quarantined after {self.failures}"
+                         + " failed jobs" if self.failures
+                         else f" {self.label} quarantined on request", "warning")
+            backoff = Settings.QUARANTINE_BACKOFF
+            probes = 0
+            while True:
+                self.next_probe = time() + backoff
+                sleep(backoff)
+                if self.retired or stopping:
+                    return
+                probes += 1
+                self.probes += 1
+                if self.probe():
+                    break
+                log_worker.debug("%s: health probe %s failed, next in %ss",
+                                 self.com, probes, backoff * 2)
+                backoff = min(backoff * 2, Settings.QUARANTINE_BACKOFF_MAX)
+            self.state = "ok"
+            self.failures = 0
+            pretty_print("sys" + self.port,
+                         f" {self.label} back online after {probes} health"
+                         + f" probe{'s' if probes > 1 else ''}", "success")
+
+    def iot_data(self):
+        return None
+
+
+class I2CWorker(Worker):
+    kind = "i2c"
+    # asks the worker to retransmit its last result
+    RESEND = "set,xmit$"
+    # [worker] keys, the attribute they set and their Settings default
+    TUNING = (("i2c_wr_rddcy", "wr_rddcy", "I2C_WR_RDDCY"),
+              ("avr_timeout", "avr_timeout", "AVR_TIMEOUT"),
+              ("poll_interval", "poll_interval", "POLL_INTERVAL"))
+
+    def __init__(self, com, threadid, rig_identifier):
+        super().__init__(com, threadid, rig_identifier)
+        self.port = port_num(com)
+        self.label = "avr" + self.port
+        # tuning applied from the [worker] section or Settings
+        self.applied = {}
+        self.configure(worker_inventory.get(format(int(com, 16), "x"), {}))
+        self.sensor_en = False
+        self.worker_type = "avr"
+        self.parser = ResponseParser()
+        self.job_diff = 0
+        self.frame_len = 0
+        self.abort_en = False
+        self.resend_en = False
+        self.fec_en = False
+        # the WorkerGroup this worker mines for
+        self.group = None
+        # job queue: frames by sequence number still waiting for
+        # a result, results read by the other lane
+        self.queue_en = False
+        self.queue_lock = thread_lock()
+        self.seq = 0
+        self.in_flight = {}
+        self.results = {}
+        # last sensor reading, kept while jobs are queued
+        self.temperature = "0.00"
+        self.humidity = "0.00"
+
+    @property
+    def fec_corrected(self):
+        return self.parser.corrected
+
+    def probe(self):
+        # the get,name$ handshake, answered by every firmware
+        answer = str(get_worker_name(i2c_bus, self.com))
+        if answer in ("", "0"):
+            return False
+        return str(self.name) in ("", "0") or answer == str(self.name)
+
+    def configure(self, cfg):
+        """
+        Apply the worker's [worker] section over the global
+        settings. Returns the keys whose value changed, what the
+        worker learned is kept for the others
+        """
+        self.cfg = cfg
+        changed = []
+        for key, attr, setting in self.TUNING:
+            value = cfg.get(key, getattr(Settings, setting))
+            if self.applied.get(key) != value:
+                self.applied[key] = value
+                setattr(self, attr, value)
+                changed.append(key)
+        return changed
+
+    def restore(self):
+        """
+        Take back what the worker learned before the last clean
+        shutdown. False when it was not left idle and needs a flush
+        """
+        if self.com not in saved_state.get("idle", ()):
+            return False
+        learned = saved_state.get("workers", {}).get(self.com, {})
+        if learned.get("hashrate") and learned.get("job_diff"):
+            self.avr_timeout = max(self.avr_timeout, learned["avr_timeout"])
+            if "i2c_wr_rddcy" not in self.cfg:
+                self.wr_rddcy = learned["wr_rddcy"]
+            self.job_diff = learned["job_diff"]
+            self.hashrate = learned["hashrate"]
+            self.hashrate_mean.append(self.hashrate)
+            self.difficulty_class = learned["difficulty_class"]
+        return True
+
+    def check_type(self, worker_name):
+        """
+        False when get,name does not match the type expected
+        by the worker's [worker] section
+        """
+        expected = self.cfg.get("type")
+        if not expected or str(worker_name).lower() == expected:
+            return True
+        pretty_print("sys" + self.port,
+                     f" expected worker type {expected} at 0x{self.port},"
+                     + f" found {worker_name}. Not mining on it", "error")
+        return False
+
+    def flush(self, period=1):
+        flush_i2c(i2c_bus, self.com, period)
+
+    def abort(self):
+        if self.in_flight:
+            # queued jobs of the other lane, its stale results
+            # are dropped by sequence number
+            return
+        if self.abort_en and set_worker_abort(i2c_bus, self.com) == "ok":
+            log_worker.debug("%s: job aborted", self.com)
+            return
+        # old firmware or no answer, wait the job out
+        self.flush(1)
+
+    def iot_data(self):
+        with self.queue_lock:
+            if not self.in_flight:
+                # a queueing worker answers get,temp$ only after the
+                # jobs ahead of it, in between its results: read the
+                # sensor when none is queued, else the last reading
+                self.temperature = get_temperature(i2c_bus, self.com)
+                self.humidity = get_humidity(i2c_bus, self.com)
+        iot_data  = self.temperature
+        iot_data += "@"
+        iot_data += self.humidity
+        return iot_data
+
+    def mine_job(self, job):
+        global i2c_retry_count
+        if self.queue_en:
+            return self.mine_queued(job)
+        com = self.com
+        seq = None
+        if self.resend_en:
+            # stale responses are told apart by sequence number
+            seq = self.seq = (self.seq + 1) % 256
+
+        retry_counter = 0
+        while True:
+            if retry_counter > 3:
+                self.abort()
+                return None
+
+            try:
+                log_worker.debug("%s: Sending job to the board", com)
+                i2c_data = self.job_frame(job, seq=seq)
+                while True:
+                    i2c_write(i2c_bus, com, i2c_data, self.wr_rddcy)
+                    log_worker.debug("%s: Reading result from the board", com)
+                    result = self.read_result(seq)
+                    if isinstance(result, WorkerResult):
+                        break
+                    # only the frame that went bad is sent again
+                    retry_counter += 1
+                    i2c_retry_count += 1
+                    if retry_counter > 3:
+                        self.abort()
+                        return None
+                    if result is ResponseParser.NAK:
+                        log_worker.debug("%s: Retry Job: %s", com, job)
+                        i2c_data = self.job_frame(job, seq=seq)
+                    else:
+                        log_worker.debug("%s: Retry result i%s", com, seq)
+                        i2c_data = result
+
+                if not result.nonce:
+                    log_worker.debug("%s Invalid result", com)
+                    raise Exception("Invalid result")
+                if Settings.VERIFY_SHARES == "y":
+                    result = self.verify(job, result)
+                break
+            except Exception as e:
+                log_worker.debug("%s: Retrying data read: %s", com, e)
+                self.note_flight(f"retry {retry_counter + 1}: {e}")
+                retry_counter += 1
+                i2c_retry_count += 1
+                self.abort()
+                continue
+
+        self.learn(job, result.nonce, result.elapsed)
+        self.ducoid = result.ducoid
+        self.retries = retry_counter
+        return result
+
+    def read_result(self, seq=None):
+        """
+        Read the response to the frame just written. Without a
+        sequence number any anomaly raises, with one a stale
+        result is skipped and the frame to retransmit is returned
+        instead: ResponseParser.NAK for the job, I2CWorker.RESEND
+        for the result
+        """
+        com = self.com
+        parser = self.parser
+        parser.reset()
+        i2c_start_time = time()
+        # waiting for the worker to finish, then its answer coming in
+        poll_start = perf_counter()
+        read_start = None
+        try:
+            while True:
+                result = parser.feed(i2c_read_byte(i2c_bus, com))
+                if read_start is None and parser.length:
+                    read_start = perf_counter()
+
+                if result is ResponseParser.NAK:
+                    # i2cs received corrupted job
+                    self.nak()
+                    if seq is None:
+                        raise Exception("I2C job corrupted")
+                    return result
+
+                if result is ResponseParser.BAD:
+                    self.bus_error("parse")
+                    if seq is None:
+                        raise Exception("Corrupted result")
+                    return self.RESEND
+
+                if result:
+                    log_worker.debug("%s i2c_responses:%s", com, result)
+                    try:
+                        result = self.check_crc(result)
+                    except Exception:
+                        if seq is None:
+                            raise
+                        return self.RESEND
+                    if seq is None or result.seq == seq:
+                        return result
+                    log_worker.debug("%s: stale result i%s dropped", com, result.seq)
+                    parser.reset()
+
+                if not parser.length:
+                    # pool less when worker is busy
+                    # feel free to play around poll_interval to find sweet spot for shares/s vs. stability
+                    sleep(self.poll_interval)
+
+                if (time() - i2c_start_time) > self.avr_timeout:
+                    self.bus_error("timeout")
+                    log_worker.debug("%s I2C timed out after %ss", com, self.avr_timeout)
+                    raise Exception("I2C timed out")
+        finally:
+            if tracer:
+                end = perf_counter()
+                tracer.add("poll", "worker", poll_start, read_start or end,
+                           {"worker": com})
+                if read_start:
+                    tracer.add("read", "worker", read_start, end,
+                               {"worker": com})
+
+    def mine_queued(self, job):
+        """
+        mine_job for workers with get,queue. The job is queued
+        behind the one the worker is hashing and its result is
+        told apart by the sequence number
+        """
+        global i2c_retry_count
+        com = self.com
+        with self.queue_lock:
+            seq = self.seq = (self.seq + 1) % 256
+            i2c_data = self.job_frame(job, seq=seq)
+            self.in_flight[seq] = i2c_data
+        try:
+            for attempt in range(4):
+                if attempt:
+                    i2c_retry_count += 1
+                    log_worker.debug("%s: resending job i%s", com, seq)
+                try:
+                    with self.queue_lock:
+                        i2c_write(i2c_bus, com, self.in_flight[seq], self.wr_rddcy)
+                except Exception as e:
+                    log_worker.debug("%s: queue write failed: %s", com, e)
+                    sleep(self.poll_interval)
+                    continue
+                # the job may wait behind a full one
+                deadline = time() + 2 * self.avr_timeout
+                with trace("poll", "worker", worker=com, seq=seq):
+                    while seq not in self.results and time() < deadline:
+                        with self.queue_lock:
+                            busy = self.poll()
+                        if not busy and seq not in self.results:
+                            sleep(self.poll_interval)
+                if seq in self.results:
+                    break
+                self.bus_error("timeout")
+                log_worker.debug("%s I2C timed out waiting for i%s", com, seq)
+            result = self.results.get(seq)
+        finally:
+            with self.queue_lock:
+                self.in_flight.pop(seq, None)
+                self.results.pop(seq, None)
+
+        if result is None or not result.nonce:
+            return None
+        try:
+            if Settings.VERIFY_SHARES == "y":
+                result = self.verify(job, result)
+        except Exception as e:
+            log_worker.debug("%s: %s", com, e)
+            return None
+        self.learn(job, result.nonce, result.elapsed)
+        self.ducoid = result.ducoid
+        return result
+
+    def poll(self):
+        """
+        Read one result byte for the queue, call with queue_lock
+        held. Returns False when the worker had nothing to send
+        """
+        global i2c_retry_count
+        parser = self.parser
+        try:
+            byte = i2c_read_byte(i2c_bus, self.com)
+            result = parser.feed(byte)
+        except Exception as e:
+            log_worker.debug("%s: queue read failed: %s", self.com, e)
+            parser.reset()
+            return False
+        if result is ResponseParser.NAK:
+            # corrupted job, the worker dropped its queue
+            self.bus_error("nak")
+            parser.reset()
+            for seq, frame in self.in_flight.items():
+                if seq not in self.results:
+                    i2c_retry_count += 1
+                    try:
+                        i2c_write(i2c_bus, self.com, frame, self.wr_rddcy)
+                    except Exception as e:
+                        log_worker.debug("%s: queue write failed: %s", self.com, e)
             return True
-    return False
+        if result is ResponseParser.BAD:
+            # lost with its sequence number, the timeout resends
+            self.bus_error("parse")
+            return True
+        if result is None:
+            return byte >= 0 and byte != 10
+        log_worker.debug("%s i2c_responses:%s", self.com, result)
+        try:
+            result = self.check_crc(result)
+        except Exception as e:
+            log_worker.debug("%s: %s", self.com, e)
+            return True
+        finally:
+            parser.reset()
+        if result.seq in self.in_flight:
+            self.results[result.seq] = result
+        else:
+            log_worker.debug("%s: stale result i%s dropped", self.com, result.seq)
+        return True
+
+    def job_frame(self, job, nonce_range=None, seq=None):
+        """
+        Job line for the worker, optionally restricted to
+        nonce_range (start, end) on workers with get,range and
+        tagged with seq on workers with get,queue
+        """
+        i2c_data = str(job[0]
+                        + Settings.SEPARATOR
+                        + job[1]
+                        + Settings.SEPARATOR
+                        + job[2])
+        if nonce_range:
+            i2c_data += Settings.SEPARATOR + f"r{nonce_range[0]}-{nonce_range[1]}"
+        if seq is not None:
+            i2c_data += Settings.SEPARATOR + f"i{seq}"
+
+        if self.parser.crc8_en:
+            i2c_data += Settings.SEPARATOR
+            i2c_data = str(i2c_data + str(crc8(i2c_data.encode())) + '\n')
+            log_worker.debug("%s: Job+crc8: %s", self.com, i2c_data)
+        else:
+            i2c_data = str(i2c_data + '\n')
+            log_worker.debug("%s: Job: %s", self.com, i2c_data)
+        if self.fec_en:
+            i2c_data = fec_encode(i2c_data[:-1]) + '\n'
+        self.frame_len = len(i2c_data)
+        return i2c_data
+
+    def nak(self):
+        log_worker.debug("%s: retransmission requested", self.com)
+        self.bus_error("nak")
+        if self.wr_rddcy < 32:
+            if self.worker_type == "others": 
+                self.wr_rddcy += 1
+                log_worker.debug("%s: increment write redundancy bytes to %s",
+                                 self.com, self.wr_rddcy)
+        else:
+            log_worker.debug("%s: write redundancy maxed out at %s",
+                             self.com, self.wr_rddcy)
+
+    def set_freq(self, freq):
+        # the get,freq answer, bus usage is measured at this clock
+        try:
+            i2c_bus.usage(int(self.com, base=16)).freq = int(freq)
+        except ValueError:
+            pass
+
+    def bus_error(self, error):
+        i2c_bus.usage(int(self.com, base=16)).errors[error] += 1
+        self.note_flight(error)
+        if error in ("timeout", "crc"):
+            self.dump_flight(error)
+
+    def note_flight(self, text):
+        with thread_lock():
+            i2clock_acquire(self.com)
+            try:
+                i2c_bus.flight(int(self.com, base=16)).error(text)
+            finally:
+                i2clock.release()
+
+    def dump_flight(self, reason, force=False):
+        """
+        Save the worker's last I2C transfers, see FlightRecorder
+        """
+        try:
+            filename = i2c_bus.flight(int(self.com, base=16)).dump(
+                self.label, reason, force)
+        except Exception as e:
+            log_worker.warning("%s: flight recorder not saved: %s", self.com, e)
+            return None
+        if filename:
+            log_worker.info("%s: %s, last I2C transfers saved to %s",
+                            self.com, reason, filename)
+        return filename
+
+    def check_crc(self, result):
+        """
+        Check the crc8 of a parsed result, filling in a corrupted
+        DUCOID from the previous response
+        """
+        global bad_crc8
+        result_crc8 = self.parser.payload_crc
+        if not result.ducoid:
+            if len(self.ducoid) == 0:
+                log_worker.debug("%s Corrupted DUCOID", self.com)
+                raise Exception("Corrupted DUCOID")
+            # ducoid corrupted
+            # use ducoid from previous response
+            result = result._replace(ducoid=self.ducoid)
+            seq = "" if result.seq is None else f"i{result.seq},"
+            result_crc8 = crc8(
+                f"{result.nonce},{result.elapsed},{self.ducoid},{seq}".encode())
+        if self.parser.crc8_en and result.crc != result_crc8:
+            bad_crc8 += 1
+            self.bad_crc8 += 1
+            self.bus_error("crc")
+            log_worker.debug("%s: crc8:: expect:%s measured:%s",
+                             self.com, result_crc8, result.crc)
+            raise Exception("crc8 checksum failed")
+        return result
+
+    def verify(self, job, result):
+        global compute_errors
+        if ducos1_verify(job[0], job[1], result.nonce):
+            return result
+        # worker computed garbage or a digit got lost on the way
+        compute_errors += 1
+        self.compute_errors += 1
+        nonce = ducos1_recover(job[0], job[1], result.nonce,
+                               int(job[2]) * 100)
+        if nonce is None:
+            raise Exception("result failed verification")
+        log_worker.debug("%s: recovered nonce %s -> %s",
+                         self.com, result.nonce, nonce)
+        self.recovered_nonces += 1
+        return result._replace(nonce=nonce)
+
+    def learn(self, job, hashes, elapsed):
+        """
+        Adapt write redundancy and timeout to a worker that
+        did hashes nonces of job in elapsed microseconds
+        """
+        com = self.com
+        hashrate_t = max(hashes * 1000000 / max(elapsed, 1), 1)
+        # experimental: guess worker type. seems like larger wr_rddcy causes more harm than good on avr
+        if hashrate_t < 400:
+            self.worker_type = "avr"
+            if "i2c_wr_rddcy" not in self.cfg:
+                self.wr_rddcy = 1
+        else:
+            self.worker_type = "others"
+
+        _avr_timeout = int(((int(job[2]) * 100) / int(hashrate_t)) * 2)
+        if _avr_timeout > self.avr_timeout:
+            log_worker.debug("%s: changing avr_timeout from %ss to %ss",
+                             com, self.avr_timeout, _avr_timeout)
+            self.avr_timeout = _avr_timeout
+        self.job_diff = int(job[2])
+
+    def select_difficulty(self):
+        """
+        Request the lowest difficulty tier at which this worker
+        stays under both the target share rate and its part of
+        the bus budget. Before the first share the tier is
+        guessed from get,name
+        """
+        difficulty_class = self.cfg.get("difficulty_class",
+                                        Settings.DIFFICULTY_CLASS)
+        if difficulty_class != "AUTO":
+            self.difficulty_class = difficulty_class
+            return
+        if not self.hashrate or not self.job_diff:
+            self.difficulty_class = ("MEGA" if self.name in FAST_WORKER_NAMES
+                                     else "AVR")
+            return
+
+        tiers = dict(DIFFICULTY_TIERS)
+        # how far the pool has scaled this worker from the nominal tier
+        scale = self.job_diff / tiers.get(self.difficulty_class, self.job_diff)
+        # a result byte is polled every poll_interval while the worker
+        # is busy, the job frame and the result cost once per share
+        budget = (Settings.I2C_BUS_BUDGET / max(len(avrport), 1)
+                  - 1 / max(self.poll_interval, 0.001))
+        share_bytes = (self.frame_len * max(self.wr_rddcy, 1)
+                       + self.parser.frame_length)
+        target = min(Settings.TARGET_SHARE_RATE, max(budget, 0) / share_bytes)
+
+        current = list(tiers).index(self.difficulty_class) \
+            if self.difficulty_class in tiers else 0
+        selected = DIFFICULTY_TIERS[-1][0]
+        for index, (tier, difficulty) in enumerate(DIFFICULTY_TIERS):
+            # nonces are uniform in 0..diff*100, on average diff*50 hashes
+            share_rate = self.hashrate / (difficulty * scale * 50)
+            # step down only with some headroom so the tier does not flap
+            if share_rate <= (target if index >= current else target * 0.8):
+                selected = tier
+                break
+
+        if selected != self.difficulty_class:
+            pretty_print("sys" + self.port,
+                         f" difficulty tier {self.difficulty_class} -> {selected}"
+                         + f" ({int(self.hashrate)} H/s, target"
+                         + f" {round(target, 2)} shares/s)", "info")
+            self.difficulty_class = selected
+
+
+class HostWorker(Worker):
+    """
+    DUCO-S1 on a spare host CPU core through host_pool
+    """
+    kind = "host"
+    miner_name = "RPI I2C Host Miner"
+
+    def __init__(self, com, threadid, rig_identifier):
+        super().__init__(com, threadid, rig_identifier)
+        self.port = com
+        self.label = com
+        self.difficulty_class = Settings.HOST_DIFFICULTY
+        self.ducoid = "None"
+
+    def mine_job(self, job):
+        try:
+            nonce, elapsed = host_pool.submit(
+                ducos1_search, job[0], job[1], int(job[2]),
+                Settings.HOST_CPU_BUDGET).result()
+        except Exception as e:
+            log_worker.debug("%s: host pool error: %s", self.com, e)
+            return None
+        if not nonce:
+            # the whole range searched, a failed job: never submit a
+            # nonce the pool is sure to reject
+            log_worker.warning("%s: no nonce found for difficulty %s",
+                               self.com, job[2])
+            return None
+        return WorkerResult(nonce, max(elapsed, 1), self.ducoid, None, None)
+
+
+class WorkerGroup(Worker):
+    """
+    I2C workers sharing every job: the nonce range is split in
+    proportion to member hashrate, the first member to find the
+    nonce wins and the others are cancelled
+    """
+    kind = "group"
+
+    def __init__(self, members, threadid, rig_identifier):
+        super().__init__("+".join(m.com for m in members),
+                         threadid, rig_identifier)
+        self.members = members
+        self.port = members[0].port
+        self.label = "grp" + self.port
+
+    def flush(self, period=1):
+        for member in self.members:
+            member.flush(period)
+
+    def abort(self):
+        for member in self.members:
+            member.abort()
+
+    def iot_data(self):
+        return self.members[0].iot_data()
+
+    def dump_flight(self, reason, force=False):
+        for member in self.members:
+            member.dump_flight(reason, force)
+
+    def probe(self):
+        return all(member.probe() for member in self.members)
+
+    def select_difficulty(self):
+        # a group stands in for one fast chip on the tier it was built for
+        if Settings.DIFFICULTY_CLASS != "AUTO":
+            self.difficulty_class = Settings.DIFFICULTY_CLASS
+
+    def split(self, max_nonce):
+        """
+        Contiguous (start, end) ranges covering 0..max_nonce, one
+        per member, sized by hashrate (equal until all are measured)
+        """
+        rates = [m.hashrate for m in self.members]
+        if not all(rates):
+            rates = [1] * len(rates)
+        total = sum(rates)
+        ranges = []
+        start = 0
+        for rate in rates[:-1]:
+            end = max(start + int((max_nonce + 1) * rate / total) - 1, start)
+            ranges.append((start, min(end, max_nonce)))
+            start = end + 1
+        ranges.append((min(start, max_nonce), max_nonce))
+        return ranges
+
+    def measured(self, member, job, hashes, elapsed):
+        if elapsed < 1000:
+            # too short to time, e.g. millisecond clock on the AVR
+            return
+        member.learn(job, hashes, elapsed)
+        member.hashrate_mean.append(hashes * 1000000 / max(elapsed, 1))
+        member.hashrate = mean(member.hashrate_mean)
+
+    def mine_job(self, job):
+        global i2c_retry_count
+        pending = {}
+        for member, nonce_range in zip(self.members,
+                                       self.split(int(job[2]) * 100)):
+            pending[member] = [nonce_range, 0]
+            member.parser.reset()
+            i2c_write(i2c_bus, member.com,
+                      member.job_frame(job, nonce_range), member.wr_rddcy)
+
+        winner = None
+        start_time = time()
+        timeout = max(m.avr_timeout for m in self.members)
+        while pending and not winner:
+            idle = True
+            for member in list(pending):
+                nonce_range, retries = pending[member]
+                try:
+                    result = member.parser.feed(i2c_read_byte(i2c_bus, member.com))
+                    if member.parser.length:
+                        idle = False
+                    if result is ResponseParser.NAK:
+                        member.nak()
+                        raise Exception("I2C job corrupted")
+                    if result is ResponseParser.BAD:
+                        raise Exception("Corrupted result")
+                    if not result:
+                        continue
+                    result = member.check_crc(result)
+                except Exception as e:
+                    # only this member's range is sent again
+                    log_worker.debug("%s: Retrying range %s: %s",
+                                     member.com, nonce_range, e)
+                    i2c_retry_count += 1
+                    if retries >= 3:
+                        del pending[member]
+                        continue
+                    pending[member][1] += 1
+                    member.parser.reset()
+                    i2c_write(i2c_bus, member.com,
+                              member.job_frame(job, nonce_range), member.wr_rddcy)
+                    continue
+
+                del pending[member]
+                member.ducoid = result.ducoid
+                if not result.nonce:
+                    # nonce is not in this member's range
+                    self.measured(member, job, nonce_range[1] - nonce_range[0] + 1,
+                                  result.elapsed)
+                    continue
+                try:
+                    result = member.verify(job, result)
+                except Exception as e:
+                    log_worker.debug("%s: %s", member.com, e)
+                    continue
+                self.measured(member, job, result.nonce - nonce_range[0] + 1,
+                              result.elapsed)
+                winner = result
+                break
+
+            if idle:
+                sleep(min(m.poll_interval for m in self.members))
+            if (time() - start_time) > timeout:
+                log_worker.debug("%s I2C timed out after %ss", self.com, timeout)
+                break
+
+        for member in pending:
+            # first found wins, an empty line cancels the rest
+            i2c_write(i2c_bus, member.com, "\n", member.wr_rddcy)
+        if winner:
+            self.ducoid = winner.ducoid
+        return winner
+
+
+workers = {}
+host_pool = None
+recorder = None
+replay = None
+share_log = None
+tracer = None
+
+
+class Recorder:
+    """
+    Append-only record of the jobs handed to the workers and
+    the results they returned, one line per event:
+        J,seq,time,worker,last_hash,expected_hash,diff
+        R,seq,time,worker,nonce,elapsed_us,wall_us,feedback
+    Replay it with --replay <file>
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, "a", encoding=Settings.ENCODING)
+        self.lock = thread_lock()
+        self.seq = 0
+
+    def job(self, worker, job):
+        if len(job) < 3:
+            return 0
+        with self.lock:
+            self.seq += 1
+            self.file.write(f"J,{self.seq},{time():.3f},{worker.label},"
+                            + ",".join(job[:3]) + "\n")
+            return self.seq
+
+    def result(self, seq, worker, result, wall, feedback):
+        if not seq:
+            return
+        nonce = result.nonce if result else "-"
+        elapsed = result.elapsed if result else "-"
+        with self.lock:
+            self.file.write(f"R,{seq},{time():.3f},{worker.label},{nonce},"
+                            + f"{elapsed},{int(wall * 1000000)},{feedback}\n")
+            self.file.flush()
+
+
+class ShareLog:
+    """
+    Share history, one CSV line per share:
+        time,worker,job,diff,nonce,compute_us,hashrate,rtt_ms,
+        feedback,reason,retries,temperature,rig,crc_errors,compute_errors
+    crc_errors and compute_errors are running totals of the worker.
+    Mining threads only queue the events, a writer thread appends
+    them every share_log_flush seconds and rotates the file at
+    share_log_size MB, keeping share_log_backups old files.
+    A log with other columns, from an older version, is rotated
+    away before the first write.
+    AVR_Miner_RPI_Analyzer.py reports on the history
+    """
+    HEADER = ("time,worker,job,diff,nonce,compute_us,hashrate,rtt_ms,"
+              + "feedback,reason,retries,temperature,rig,crc_errors,"
+              + "compute_errors\n")
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.events = Queue()
+        self.lock = thread_lock()
+        self.checked = False
+        Thread(target=self.writer, daemon=True).start()
+
+    def share(self, worker, job, result, hashrate, rtt, feedback, iot_data):
+        self.events.put((time(), worker.label, job[0][:8], job[2],
+                         result.nonce, result.elapsed, hashrate, rtt,
+                         feedback[0], feedback[1] if len(feedback) > 1 else "",
+                         worker.retries,
+                         iot_data.split("@")[0] if iot_data else "",
+                         worker.rig_identifier, worker.bad_crc8,
+                         worker.compute_errors))
+
+    def writer(self):
+        while True:
+            sleep(Settings.SHARE_LOG_FLUSH)
+            try:
+                self.flush()
+            except Exception as e:
+                debug_output(f'Error writing share log: {e}')
+
+    def flush(self):
+        # drained under the lock, so a flush on exit cannot finish
+        # while the writer thread still holds a batch
+        with self.lock:
+            batch = []
+            while True:
+                try:
+                    batch.append(self.events.get_nowait())
+                except Empty:
+                    break
+            if not batch:
+                return
+            if (path.exists(self.filename) and path.getsize(self.filename)
+                    >= Settings.SHARE_LOG_SIZE * 1024 * 1024):
+                self.rotate()
+            if not self.checked and path.exists(self.filename):
+                with open(self.filename, encoding=Settings.ENCODING) as f:
+                    header = f.readline()
+                if header != self.HEADER:
+                    self.rotate()
+            self.checked = True
+            new = not path.exists(self.filename)
+            with open(self.filename, "a", encoding=Settings.ENCODING) as f:
+                if new:
+                    f.write(self.HEADER)
+                for event in batch:
+                    f.write(f"{event[0]:.3f}," + ",".join(
+                        str(field).replace(",", ";") for field in event[1:])
+                        + "\n")
+
+    def rotate(self):
+        # share.csv -> share.csv.1 -> ... -> share.csv.<backups>
+        for i in range(Settings.SHARE_LOG_BACKUPS - 1, 0, -1):
+            if path.exists(f"{self.filename}.{i}"):
+                os.replace(f"{self.filename}.{i}", f"{self.filename}.{i + 1}")
+        if Settings.SHARE_LOG_BACKUPS > 0:
+            os.replace(self.filename, f"{self.filename}.1")
+        else:
+            os.remove(self.filename)
+
+
+class Tracer:
+    """
+    Timeline of the mining threads for chrome://tracing or
+    ui.perfetto.dev: spans of bus transfers, worker polls and
+    pool traffic kept in a ring of the last trace_events. The
+    Chrome trace-event JSON is written by the control command
+    trace and on exit
+    """
+    def __init__(self, filename, size):
+        self.filename = filename
+        self.events = deque(maxlen=size)
+        self.origin = perf_counter()
+
+    def add(self, name, cat, begin, end, args):
+        # deque.append is atomic, the mining threads need no lock
+        self.events.append((name, cat, get_ident(), begin, end, args))
+
+    @contextmanager
+    def span(self, name, cat, args):
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, cat, begin, perf_counter(), args)
+
+    def export(self, filename=None):
+        filename = filename or self.filename
+        pid = os.getpid()
+        trace_events = [{"name": "process_name", "ph": "M", "pid": pid,
+                         "args": {"name": "AVR Miner " + Settings.VER}}]
+        trace_events += [{"name": "thread_name", "ph": "M", "pid": pid,
+                          "tid": thread.ident, "args": {"name": thread.name}}
+                         for thread in threads()]
+        for name, cat, tid, begin, end, args in list(self.events):
+            trace_events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((begin - self.origin) * 1000000, 1),
+                "dur": round((end - begin) * 1000000, 1), "args": args})
+        with open(filename, "w", encoding=Settings.ENCODING) as f:
+            jsondump({"traceEvents": trace_events,
+                      "displayTimeUnit": "ms"}, f)
+        return filename
+
+
+NO_TRACE = nullcontext()
+
+
+def trace(name, cat, **args):
+    """
+    Span on the trace timeline, nothing unless trace_file is set
+    """
+    if tracer is None:
+        return NO_TRACE
+    return tracer.span(name, cat, args)
+
+
+RecordedJob = namedtuple("RecordedJob", "time worker job nonce elapsed")
+
+def load_recording(filename):
+    """
+    Jobs of a Recorder file in order, with the recorded
+    result where there is one
+    """
+    jobs = []
+    index = {}
+    with open(filename, encoding=Settings.ENCODING) as f:
+        for line in f:
+            field = line.rstrip("\n").split(",")
+            try:
+                if field[0] == "J" and len(field) == 7:
+                    int(field[6])
+                    # seq restarts with every run, a result
+                    # belongs to the latest job carrying its seq
+                    index[field[1]] = len(jobs)
+                    jobs.append(RecordedJob(float(field[2]), field[3],
+                                            field[4:7], None, None))
+                elif (field[0] == "R" and len(field) >= 8
+                        and field[1] in index and field[4] != "-"):
+                    i = index.pop(field[1])
+                    jobs[i] = jobs[i]._replace(nonce=int(field[4]),
+                                               elapsed=int(field[5]))
+            except ValueError:
+                # torn line from an interrupted run
+                continue
+    return jobs
+
+
+class ReplayPool:
+    """
+    Stands in for the pool when running with --replay: serves
+    the recorded jobs in order at the recorded pace times speed
+    (0 = as fast as the workers take them) and judges every
+    submitted nonce against hashlib
+    """
+    def __init__(self, filename, speed=1.0):
+        self.filename = filename
+        self.jobs = deque(load_recording(filename))
+        self.total = len(self.jobs)
+        self.speed = speed
+        self.lock = thread_lock()
+        self.sockets = []
+        self.first = self.jobs[0].time if self.jobs else 0
+        self.start = None
+        self.finished = False
+        # submitter -> [good, bad, compute s, recorded compute s]
+        self.stats = {}
+
+    def connect(self):
+        s = ReplaySocket(self)
+        with self.lock:
+            self.sockets.append(s)
+        return s
+
+    def next_job(self):
+        with self.lock:
+            if not self.jobs:
+                return None
+            job = self.jobs.popleft()
+            if self.start is None:
+                self.start = time()
+        if self.speed > 0:
+            delay = (self.start + (job.time - self.first) / self.speed
+                     - time())
+            if delay > 0:
+                sleep(delay)
+        return job
+
+    def judge(self, submitter, job, nonce, compute_time):
+        good = ducos1_verify(job.job[0], job.job[1], nonce)
+        with self.lock:
+            stat = self.stats.setdefault(submitter, [0, 0, 0, 0])
+            stat[0 if good else 1] += 1
+            if job.elapsed:
+                stat[2] += compute_time
+                stat[3] += job.elapsed / 1000000
+        return good
+
+    def finish(self):
+        with self.lock:
+            finishing = not self.finished
+            self.finished = True
+        if not finishing:
+            while True:
+                sleep(1)
+
+        # let the workers still hashing submit
+        deadline = time() + Settings.SOC_TIMEOUT
+        while time() < deadline and any(s.job for s in self.sockets):
+            sleep(0.1)
+
+        good = sum(stat[0] for stat in self.stats.values())
+        bad = sum(stat[1] for stat in self.stats.values())
+        report = (f" Replay of {self.filename} finished: "
+                  + f"{good} good, {bad} bad, "
+                  + f"{self.total - good - bad} unanswered")
+        for submitter, stat in self.stats.items():
+            report += (f"\n\t\t‖ {submitter}: {stat[0]} good, {stat[1]} bad")
+            if stat[3]:
+                report += (f", compute {round(stat[2], 2)}s vs "
+                           + f"{round(stat[3], 2)}s recorded")
+        pretty_print("sys0", report, "success" if not bad else "warning")
+        if share_log:
+            share_log.flush()
+        console_flush()
+        _exit(0 if not bad else 1)
+
+
+class ReplaySocket:
+    """
+    The part of a pool socket mining_loop uses, answered
+    by a ReplayPool
+    """
+    def __init__(self, pool):
+        self.pool = pool
+        self.job = None
+        self.reply = Settings.VER
+
+    def sendall(self, data):
+        msg = data.decode(Settings.ENCODING).split(Settings.SEPARATOR)
+        if msg[0] == "MOTD":
+            self.reply = (f"Replaying {self.pool.total} jobs"
+                          + f" from {self.pool.filename}")
+        elif msg[0] == "JOB":
+            self.job = self.pool.next_job()
+            if self.job is None:
+                self.pool.finish()
+            self.reply = Settings.SEPARATOR.join(self.job.job)
+        else:
+            job, self.job = self.job, None
+            try:
+                nonce = int(msg[0])
+                compute_time = nonce / float(msg[1]) if float(msg[1]) else 0
+                submitter = msg[4] if msg[4] != "None" else msg[2]
+            except (ValueError, IndexError):
+                self.reply = "BAD,Malformed result"
+                return
+            if job is None:
+                self.reply = "BAD,No job"
+            elif self.pool.judge(submitter, job, nonce, compute_time):
+                self.reply = "GOOD"
+            else:
+                self.reply = "BAD,Replay mismatch"
+
+    def recv(self, limit=128):
+        reply, self.reply = self.reply, ""
+        return (reply + "\n").encode(Settings.ENCODING)
+
+    def close(self):
+        pass
 
 def debouncer(fname, i2c_bus, com):
     count=0
@@ -1076,29 +3531,15 @@ def get_worker_cfg_global(i2c_bus, com):
     worker_cfg_global["sensor_en"] = 1 if sensor_en != "0" else 0
     worker_cfg_global["baton_status"] = get_worker_baton_status(i2c_bus, com)
     worker_cfg_global["single_core_only"] = get_worker_core_status(i2c_bus, com)
-    worker_cfg_global["worker_name"] = get_worker_name(i2c_bus, com)
     worker_cfg_global["valid"] = True
 
 def mine_avr(com, threadid, fastest_pool, thread_rigid):
-    global hashrate
-    global bad_crc8
-    global i2c_retry_count
-    global hashrate_mean
-    start_time = time()
-    report_shares = 0
-    last_report_share = 0
-    last_bad_crc8 = 0
-    last_i2c_retry_count = 0
-    wr_rddcy = Settings.I2C_WR_RDDCY
-    avr_timeout = Settings.AVR_TIMEOUT
-    iot_data = None
-    crc8_en = 1
-    user_iot = Settings.IoT_EN
-    ducoid = ""
-    worker_type = "avr"
+    worker = workers[com] = I2CWorker(com, threadid, thread_rigid)
+    user_iot = worker.cfg.get("duinoiot_en", Settings.IoT_EN)
     worker_cfg_shared = True if Settings.WORKER_CFG_SHARED == "y" else False
 
-    flush_i2c(i2c_bus, com)
+    if not worker.restore():
+        flush_i2c(i2c_bus, com)
 
     while worker_cfg_global["valid"] is not True and worker_cfg_shared:
         sleep(1)
@@ -1109,7 +3550,6 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
         sensor_en = worker_cfg_global["sensor_en"]
         baton_status = worker_cfg_global["baton_status"]
         single_core_only = worker_cfg_global["single_core_only"]
-        worker_name = worker_cfg_global["worker_name"]
     else:
         i2c_freq = get_worker_i2cfreq(i2c_bus, com)
         crc8_en = debouncer("get_worker_crc8_status", i2c_bus, com)
@@ -1117,31 +3557,226 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
         sensor_en = 1 if sensor_en != "0" else 0
         baton_status = get_worker_baton_status(i2c_bus, com)
         single_core_only = get_worker_core_status(i2c_bus, com)
-        worker_name = get_worker_name(i2c_bus, com)
+    # always the worker's own: a mixed rig has more than one
+    # type, and check_type and the health probe compare with it.
+    # A Nano behind a Pico must not get queue lanes, set,xmit$
+    # or FEC frames it does not understand
+    worker_name = get_worker_name(i2c_bus, com)
+    abort_en = get_worker_abort_status(i2c_bus, com)
+    queue_en = get_worker_queue_status(i2c_bus, com)
+    resend_en = get_worker_resend_status(i2c_bus, com)
+    fec_en = get_worker_fec_status(i2c_bus, com)
 
     worker_print(com, i2c_clock=i2c_freq, crc8_en=crc8_en, 
                 sensor_en=sensor_en, baton_status=baton_status,
                 single_core_only=single_core_only, worker_name=worker_name, 
+                abort_en=abort_en, queue_en=queue_en, resend_en=resend_en,
+                fec_en=fec_en,
                 shared_worker_cfg=str(worker_cfg_shared))
 
+    if not worker.check_type(worker_name):
+        worker.retired = True
+        return
+
     if sensor_en == 0 and "y" in user_iot.lower():
         user_iot = "n"
         pretty_print("sys" + port_num(com), " worker do not have sensor enabled. Disabling IoT reporting", "warning")
-    
+
+    worker.set_freq(i2c_freq)
+    worker.parser = ResponseParser(bool(int(crc8_en)))
+    if fec_en == 1 and Settings.I2C_FEC == "y":
+        worker.fec_en = True
+        worker.parser = FecResponseParser(bool(int(crc8_en)))
+    worker.sensor_en = bool(sensor_en)
+    worker.iot_en = bool(sensor_en) and user_iot == "y"
+    worker.name = worker_name
+    worker.abort_en = abort_en == 1
+    worker.resend_en = resend_en == 1
+    worker.select_difficulty()
+    if queue_en == 1 and Settings.JOB_QUEUE == "y":
+        # second lane fetches the next job while the worker hashes
+        worker.queue_en = True
+        Thread(target=mining_loop, args=(worker, fastest_pool, 1)).start()
+    mining_loop(worker, fastest_pool)
+
+
+def mine_group(members, fastest_pool, thread_rigid):
+    """
+    members: (com, threadid) of the I2C workers in one
+    nonce_split_groups entry, the group uses the threadid of
+    its first member, members mining on their own keep theirs
+    """
+    group = []
+    for com, threadid in members:
+        worker = workers[com] = I2CWorker(com, threadid, thread_rigid)
+        if not worker.restore():
+            flush_i2c(i2c_bus, com)
+        crc8_en = debouncer("get_worker_crc8_status", i2c_bus, com)
+        range_en = get_worker_range_status(i2c_bus, com)
+        abort_en = get_worker_abort_status(i2c_bus, com)
+        worker.name = get_worker_name(i2c_bus, com)
+        worker.set_freq(get_worker_i2cfreq(i2c_bus, com))
+        worker_print(com, crc8_en=crc8_en, range_en=range_en, abort_en=abort_en,
+                     worker_name=worker.name, nonce_split_group=members[0][0])
+        if not worker.check_type(worker.name):
+            worker.retired = True
+            continue
+        worker.parser = ResponseParser(bool(int(crc8_en)))
+        worker.abort_en = abort_en == 1
+        if range_en == 1:
+            group.append(worker)
+        else:
+            pretty_print("sys" + worker.port,
+                         " worker firmware has no nonce range support,"
+                         + " mining on its own", "warning")
+            Thread(target=mine_avr,
+                   args=(com, threadid, fastest_pool, thread_rigid)).start()
+    if not group:
+        return
+
+    worker = WorkerGroup(group, group[0].threadid, thread_rigid)
+    workers[worker.com] = worker
+    for member in group:
+        member.group = worker
+    worker.select_difficulty()
+    pretty_print("sys" + worker.port,
+                 f" nonce range split across {worker.com}", "success")
+    mining_loop(worker, fastest_pool)
+
+
+def hotplug_addresses(configured):
+    """
+    Addresses the hot-plug scanner watches: hotplug_range as a
+    comma separated list of hex addresses and ranges (0a,20-2f),
+    or by default the configured workers
+    """
+    if Settings.HOTPLUG_RANGE == "None":
+        return sorted(configured
+                      | {int(com, 16) for com in worker_inventory})
+    addresses = set()
+    for part in Settings.HOTPLUG_RANGE.split(","):
+        start, _, end = part.strip().partition("-")
+        addresses.update(range(int(start, 16), int(end or start, 16) + 1))
+    return sorted(addresses)
+
+
+def hotplug_scan(fastest_pool, thread_rigid):
+    """
+    Background thread: start a worker for every new address in
+    hotplug_range that answers the get,name$ handshake, retire
+    workers whose address stopped answering
+    """
+    configured = {int(com, 16) for com in avrport}
+    missing = {}
+    # answered the address probe but not get,name$, not a worker
+    foreign = set()
     while True:
+        sleep(Settings.HOTPLUG_SCAN)
+        active = {int(com, 16): com for com in avrport}
+        for addr in hotplug_addresses(configured):
+            if addr in foreign:
+                continue
+            with thread_lock():
+                i2clock_acquire(format(addr, "x"))
+                try:
+                    present = i2c_bus.present(addr)
+                finally:
+                    i2clock.release()
+
+            com = active.get(addr)
+            if com is not None:
+                worker = workers.get(com)
+                if (present or worker is None or worker.kind != "i2c"
+                        or worker.group):
+                    missing.pop(com, None)
+                    continue
+                # twice in a row, one scan may hit a bus glitch
+                missing[com] = missing.get(com, 0) + 1
+                if missing[com] >= 2:
+                    del missing[com]
+                    retire_worker(worker)
+                continue
+
+            if not present:
+                continue
+            com = format(addr, "x")
+            worker_name = get_worker_name(i2c_bus, com)
+            if str(worker_name) in ("", "0"):
+                # some other I2C device, leave it alone from now on
+                foreign.add(addr)
+                pretty_print("sys" + port_num(com),
+                             f" device at 0x{port_num(com)} is not a worker,"
+                             + " no longer scanning it", "warning")
+                continue
+            pretty_print("sys" + port_num(com),
+                         f" new worker {worker_name} found at 0x{port_num(com)},"
+                         + " starting it", "success")
+            start_worker(com, fastest_pool,
+                         worker_inventory.get(com, {}).get(
+                             "identifier", thread_rigid))
+
+
+def start_worker(com, fastest_pool, thread_rigid):
+    """
+    Start mining on an I2C worker added after startup
+    """
+    threadid = len(hashrate_list)
+    hashrate_list.append(0)
+    avrport.append(com)
+    Thread(target=mine_avr,
+           args=(com, threadid, fastest_pool, thread_rigid)).start()
+
+
+def retire_worker(worker, reason="is gone"):
+    """
+    Stop mining on an unplugged or removed worker, its thread
+    exits at the next job or health probe
+    """
+    worker.retired = True
+    if worker.com in avrport:
+        avrport.remove(worker.com)
+    workers.pop(worker.com, None)
+    hashrate_list[worker.threadid] = 0
+    pretty_print("sys" + worker.port,
+                 f" worker at 0x{worker.port} {reason}, retired", "warning")
+
+
+def mine_host(com, threadid, fastest_pool, thread_rigid):
+    worker = workers[com] = HostWorker(com, threadid, thread_rigid)
+    mining_loop(worker, fastest_pool)
+
+
+def mining_loop(worker, fastest_pool, lane=0):
+    """
+    Pool side of a worker: fetch jobs, let the worker hash them,
+    submit the results and report. Queueing workers run one
+    loop per lane, each with its own pool connection
+    """
+    global hashrate, pool_motd
+    com = worker.com
+    threadid = worker.threadid
+    iot_data = None
+    motd = None
+    s = None
+    mining_lanes.add((com, lane))
+    # the thread's row on the trace timeline
+    current_thread().name = worker.label + (f" lane {lane}" if lane else "")
+
+    while not worker.retired and not stopping:
         
         retry_counter = 0
-        while True:
+        while not stopping:
             try:
                 if retry_counter > 3:
                     fastest_pool = Client.fetch_pool()
                     retry_counter = 0
 
-                debug_output(f'Connecting to {fastest_pool}')
-                s = Client.connect(fastest_pool)
-                server_version = Client.recv(s, 6)
+                log_net.debug("Connecting to %s", fastest_pool)
+                with trace("connect", "net", worker=com):
+                    s = Client.connect(fastest_pool)
+                    server_version = Client.recv(s, 6)
 
-                if threadid == 0:
+                if threadid == 0 and lane == 0:
                     if float(server_version) <= float(Settings.VER):
                         pretty_print(
                             'net0', get_string('connected')
@@ -1163,6 +3798,7 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
 
                     if "\n" in motd:
                         motd = motd.replace("\n", "\n\t\t")
+                    pool_motd = motd
 
                     pretty_print("net" + str(threadid),
                                  get_string("motd") + Fore.RESET
@@ -1176,14 +3812,27 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
                 retry_counter += 1
                 sleep(10)
 
-        pretty_print('sys' + port_num(com),
+        pretty_print('sys' + worker.port,
                      get_string('mining_start') + Style.NORMAL + Fore.RESET
                      + get_string('mining_algorithm') + str(com) + ')',
                      'success')
 
-        flush_i2c(i2c_bus,com)
+        # whatever the worker still hashes belongs to the old connection
+        if lane == 0 and not stopping:
+            worker.abort()
                 
-        while True:
+        while not worker.retired and not stopping:
+            iot_data = None
+            total_hashrate = sum(hashrate_list)
+            while worker.paused and not stopping:
+                sleep(0.5)
+            if worker.quarantine_requested:
+                hashrate_list[threadid] = 0
+                hashrate = sum(hashrate_list)
+                s.close()
+                worker.quarantine()
+                break
+
             try:
             
                 if config["AVR Miner"]["mining_key"] != "None":
@@ -1191,201 +3840,105 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
                 else:
                     key = config["AVR Miner"]["mining_key"]
                     
-                debug_output(com + ': Requesting job')
+                log_net.debug("%s: Requesting job", com)
                 job_request  = 'JOB'
                 job_request += Settings.SEPARATOR
                 job_request += str(username)
                 job_request += Settings.SEPARATOR
-                job_request += 'AVR'
+                job_request += worker.difficulty_class
                 job_request += Settings.SEPARATOR
                 job_request += str(key)
 
-                if sensor_en and user_iot == "y":
+                if worker.iot_en:
                     job_request += Settings.SEPARATOR
-                    iot_data  = get_temperature(i2c_bus,com)
-                    iot_data += "@"
-                    iot_data += get_humidity(i2c_bus,com)
+                    iot_data = worker.iot_data()
                     job_request += iot_data
 
-                debug_output(com + f": {job_request}") 
+                log_net.debug("%s: %s", com, job_request) 
                 
-                Client.send(s, job_request)
-                job = Client.recv(s, 128).split(Settings.SEPARATOR)
-                debug_output(com + f": Received: {job[0]}")
+                with trace("job fetch", "net", worker=com):
+                    Client.send(s, job_request)
+                    job = Client.recv(s, 128).split(Settings.SEPARATOR)
+                log_net.debug("%s: Received: %s", com, job[0])
 
                 try:
                     diff = int(job[2])
                 except:
-                    pretty_print("sys" + port_num(com),
+                    pretty_print("sys" + worker.port,
                                  f" Node message: {job[1]}", "warning")
                     sleep(3)
             except Exception as e:
-                pretty_print('net' + port_num(com),
+                pretty_print('net' + worker.port,
                              get_string('connecting_error')
                              + Style.NORMAL + Fore.RESET
                              + f' (err handling result: {e})', 'error')
                 sleep(3)
                 break
 
-            retry_counter = 0
-            while True:
-                if retry_counter > 3:
-                    flush_i2c(i2c_bus,com)
-                    break
+            if stopping:
+                # taken while the shutdown began, never started
+                break
 
-                try:
-                    debug_output(com + ': Sending job to the board')
-                    i2c_data = str(job[0]
-                                    + Settings.SEPARATOR
-                                    + job[1]
-                                    + Settings.SEPARATOR
-                                    + job[2])
-                                    
-                    if crc8_en :
-                        i2c_data += Settings.SEPARATOR
-                        i2c_data = str(i2c_data + str(crc8(i2c_data.encode())) + '\n')
-                        debug_output(com + f': Job+crc8: {i2c_data}')
-                    else:
-                        i2c_data = str(i2c_data + '\n')
-                        debug_output(com + f': Job: {i2c_data}')
-                        
-                    i2c_write(i2c_bus, com, i2c_data, wr_rddcy)
-                    debug_output(com + ': Reading result from the board')
-                    i2c_responses = ''
-                    i2c_rdata = ''
-                    substitute = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹","0123456789")
-                    result = []
-                    i2c_start_time = time()
-                    sleep_en = True
-                    while True:
-                        i2c_rdata = i2c_read(i2c_bus, com)
-
-                        if is_subscript(i2c_rdata):
-                            # rare incident where MSB bit flipped
-                            i2c_rdata = i2c_rdata.translate(substitute)
-                            
-                        if ('$' in i2c_rdata):
-                            # worker cmd overflow into response area. dump it
-                            i2c_responses = ''
-                            
-                        if ((i2c_rdata.isalnum()) or (',' in i2c_rdata)):
-                            sleep_en = False
-                            i2c_responses += i2c_rdata.strip()
-                            
-                        elif ('#' in i2c_rdata):
-                            # i2cs received corrupted job
-                            debug_output(com + f': Received response: {i2c_responses}')
-                            debug_output(com + f': Retry Job: {job}')
-                            debug_output(com + f': retransmission requested')
-                            if wr_rddcy < 32:
-                                if worker_type == "others": 
-                                    wr_rddcy += 1
-                                    debug_output(com + f': increment write redundancy bytes to {wr_rddcy}')
-                            else:
-                                debug_output(com + f': write redundancy maxed out at {wr_rddcy}')
-                            raise Exception("I2C job corrupted")
-                            
-                        if sleep_en:
-                            # pool less when worker is busy
-                            # feel free to play around this number to find sweet spot for shares/s vs. stability
-                            sleep(0.05)
-                            
-                        result = i2c_responses.split(',')
-                        if (((len(result)==4 and crc8_en) or 
-                            (len(result)==3 and not crc8_en)) and 
-                            ('\n' in i2c_rdata)):
-                            debug_output(com + " i2c_responses:" + f'{i2c_responses}')
-                            break
-                        
-                        if (time() - i2c_start_time) > avr_timeout:
-                            debug_output(com + f' I2C timed out after {avr_timeout}s')
-                            raise Exception("I2C timed out")
-
-                    if result[0] and result[1]:
-                        _ = int(result[0])
-                        if not _:
-                            debug_output(com + ' Invalid result')
-                            raise Exception("Invalid result")
-                        _ = int(result[1])
-                        if not result[2].isalnum() and len(ducoid) == 0:
-                            debug_output(com + ' Corrupted DUCOID')
-                            raise Exception("Corrupted DUCOID")
-                        if not result[2].isalnum() and len(ducoid) > 0:
-                            # ducoid corrupted
-                            # use ducoid from previous response
-                            result[2] = ducoid
-                            # reconstruct i2c_responses
-                            i2c_responses = str(result[0]
-                                                + Settings.SEPARATOR
-                                                + result[1]
-                                                + Settings.SEPARATOR
-                                                + result[2])
-                        if int(crc8_en):
-                            _resp = i2c_responses.rpartition(Settings.SEPARATOR)[0]+Settings.SEPARATOR
-                            result_crc8 = crc8(_resp.encode())
-                            if (int(result[3]) != result_crc8):
-                                bad_crc8 += 1
-                                debug_output(com + f': crc8:: expect:{result_crc8} measured:{result[3]}')
-                                raise Exception("crc8 checksum failed")
-                        break
-                    else:
-                        raise Exception("No data received from AVR")
-                except Exception as e:
-                    debug_output(com + f': Retrying data read: {e}')
-                    retry_counter += 1
-                    i2c_retry_count += 1
-                    flush_i2c(i2c_bus,com,1)
-                    continue
+            seq = recorder.job(worker, job) if recorder else 0
+            mine_start = time()
+            worker.busy += 1
+            try:
+                with trace("mine", "worker", worker=com, diff=job[2]):
+                    result = worker.mine_job(job)
+            finally:
+                worker.busy -= 1
+            mine_time = time() - mine_start
 
             try:
-                computetime = round(int(result[1]) / 1000000, 5)
-                num_res = int(result[0])
+                computetime = round(result.elapsed / 1000000, 5)
+                num_res = result.nonce
                 hashrate_t = round(num_res / computetime, 2)
 
-                # experimental: guess worker type. seems like larger wr_rddcy causes more harm than good on avr
-                if hashrate_t < 400:
-                    worker_type = "avr"
-                    wr_rddcy = 1
-                else:
-                    worker_type = "others"
-
-                _avr_timeout = int(((int(diff) * 100) / int(hashrate_t)) * 2)
-                if _avr_timeout > avr_timeout:
-                    debug_output(com + f': changing avr_timeout from {avr_timeout}s to {_avr_timeout}s')
-                    avr_timeout = _avr_timeout
-
-                hashrate_mean.append(hashrate_t)
-                hashrate = mean(hashrate_mean)
-                hashrate_list[threadid] = hashrate
+                worker.hashrate_mean.append(hashrate_t)
+                worker.hashrate = mean(worker.hashrate_mean)
+                hashrate_list[threadid] = worker.hashrate
                 total_hashrate = sum(hashrate_list)
+                hashrate = total_hashrate
+                worker.select_difficulty()
+                worker.job_result(True)
             except Exception as e:
-                pretty_print('sys' + port_num(com),
+                pretty_print('sys' + worker.port,
                              get_string('mining_avr_connection_error')
                              + Style.NORMAL + Fore.RESET
                              + ' (no response from the board: '
                              + f'{e}, please check the connection, '
                              + 'port setting or reset the AVR)', 'warning')
-                debug_output(com + f': Retry count: {retry_counter}')
-                debug_output(com + f': Job: {job}')
-                debug_output(com + f': Result: {result}')
-                flush_i2c(i2c_bus,com)
+                log_worker.debug("%s: Job: %s", com, job)
+                log_worker.debug("%s: Result: %s", com, result)
+                if recorder:
+                    recorder.result(seq, worker, None, mine_time, "FAIL")
+                worker.transactions.append((time(), job[2] if len(job) > 2 else "-",
+                                            "-", "-", int(mine_time * 1000), "FAIL"))
+                worker.abort()
+                if worker.job_result(False):
+                    # no pool connection and no bus time while it is out
+                    hashrate_list[threadid] = 0
+                    hashrate = sum(hashrate_list)
+                    s.close()
+                    worker.quarantine()
                 break
-            ducoid = result[2]
 
             try:
-                Client.send(s, str(num_res)
-                            + Settings.SEPARATOR
-                            + str(hashrate_t)
-                            + Settings.SEPARATOR
-                            + f'RPI I2C AVR Miner {Settings.VER}'
-                            + Settings.SEPARATOR
-                            + str(thread_rigid)
-                            #+ str(port_num(com))
-                            + Settings.SEPARATOR
-                            + str(result[2]))
+                with trace("submit", "net", worker=com, nonce=num_res):
+                    Client.send(s, str(num_res)
+                                + Settings.SEPARATOR
+                                + str(hashrate_t)
+                                + Settings.SEPARATOR
+                                + f'{worker.miner_name} {Settings.VER}'
+                                + Settings.SEPARATOR
+                                + str(worker.rig_identifier)
+                                #+ str(port_num(com))
+                                + Settings.SEPARATOR
+                                + str(result.ducoid))
 
                 responsetimetart = now()
-                feedback = Client.recv(s, 64).split(",")
+                with trace("feedback", "net", worker=com):
+                    feedback = Client.recv(s, 64).split(",")
                 responsetimestop = now()
 
                 time_delta = (responsetimestop -
@@ -1393,75 +3946,301 @@ def mine_avr(com, threadid, fastest_pool, thread_rigid):
                 ping_mean.append(round(time_delta / 1000))
                 ping = mean(ping_mean)
                 diff = get_prefix("", int(diff), 0)
-                debug_output(com + f': retrieved feedback: {" ".join(feedback)}')
+                log_net.debug("%s: retrieved feedback: %s", com, feedback)
+                if recorder:
+                    recorder.result(seq, worker, result, mine_time,
+                                    " ".join(feedback))
+                worker.transactions.append((time(), job[2], result.nonce,
+                                            result.elapsed, int(mine_time * 1000),
+                                            " ".join(feedback)))
             except Exception as e:
-                pretty_print('net' + port_num(com),
+                pretty_print('net' + worker.port,
                              get_string('connecting_error')
                              + Style.NORMAL + Fore.RESET
                              + f' (err handling result: {e})', 'error')
-                debug_output(com + f': error parsing response: {e}')
+                log_net.debug("%s: error parsing response: %s", com, e)
                 sleep(5)
                 break
 
+            if feedback[0] in ('GOOD', 'BLOCK'):
+                worker.accepted += 1
+            else:
+                worker.rejected += 1
+            if share_log:
+                share_log.share(worker, job, result, hashrate_t,
+                                round(time_delta / 1000), feedback, iot_data)
             if feedback[0] == 'GOOD':
                 shares[0] += 1
-                share_print(port_num(com), "accept",
-                            shares[0], shares[1], hashrate, total_hashrate,
+                share_print(worker.label, "accept",
+                            shares[0], shares[1], worker.hashrate, total_hashrate,
                             computetime, diff, ping, None, iot_data)
             elif feedback[0] == 'BLOCK':
                 shares[0] += 1
                 shares[2] += 1
-                share_print(port_num(com), "block",
-                            shares[0], shares[1], hashrate, total_hashrate,
+                share_print(worker.label, "block",
+                            shares[0], shares[1], worker.hashrate, total_hashrate,
                             computetime, diff, ping, None, iot_data)
             elif feedback[0] == 'BAD':
                 shares[1] += 1
                 reason = feedback[1] if len(feedback) > 1 else None
-                share_print(port_num(com), "reject",
+                share_print(worker.label, "reject",
                             shares[0], shares[1], hashrate_t, total_hashrate,
                             computetime, diff, ping, reason, iot_data)
             else:
                 shares[1] += 1
-                share_print(port_num(com), "reject",
+                share_print(worker.label, "reject",
                             shares[0], shares[1], hashrate_t, total_hashrate,
                             computetime, diff, ping, feedback, iot_data)
-                debug_output(com + f': Job: {job}')
-                debug_output(com + f': Result: {result}')
-                flush_i2c(i2c_bus,com,5)
+                log_worker.debug("%s: Job: %s", com, job)
+                log_worker.debug("%s: Result: %s", com, result)
+                worker.flush(5)
                 
             if shares[0] % 100 == 0 and shares[0] > 1:
                 pretty_print("sys0",
                             f"{get_string('surpassed')} {shares[0]} {get_string('surpassed_shares')}",
                             "success")
 
-            title(get_string('duco_avr_miner') + str(Settings.VER)
-                  + f') - {shares[0]}/{(shares[0] + shares[1])}'
-                  + get_string('accepted_shares'))
-
-            end_time = time()
-            elapsed_time = end_time - start_time
-            if threadid == 0 and elapsed_time >= Settings.REPORT_TIME:
-                report_shares = shares[0] - last_report_share
-                report_bad_crc8 = bad_crc8 - last_bad_crc8
-                report_i2c_retry_count = i2c_retry_count - last_i2c_retry_count
-                uptime = calculate_uptime(mining_start_time)
-                pretty_print("net" + str(threadid),
-                                 " POOL_INFO: " + Fore.RESET
-                                 + Style.NORMAL + str(motd),
-                                 "success")
-                periodic_report(start_time, end_time, report_shares,
-                                shares[2], hashrate, uptime, 
-                                report_bad_crc8, report_i2c_retry_count)
-                
-                start_time = time()
-                last_report_share = shares[0]
-                last_bad_crc8 = bad_crc8
-                last_i2c_retry_count = i2c_retry_count
+            set_title(get_string('duco_avr_miner') + str(Settings.VER)
+                      + f') - {shares[0]}/{(shares[0] + shares[1])}'
+                      + get_string('accepted_shares'))
+
+
+    # retired by the hot-plug scanner or shutting down
+    log_worker.debug("%s: mining thread stopped", com)
+    hashrate_list[threadid] = 0
+    if s:
+        s.close()
+    mining_lanes.discard((com, lane))
+
+
+def control_server():
+    """
+    Background thread: answer the commands of CONTROL_COMMANDS
+    on the unix socket control_socket, one command per line.
+    Every answer ends with a line "ok" or "error <reason>"
+    """
+    from socket import AF_UNIX
+    filename = Settings.CONTROL_SOCKET
+    if not path.isabs(filename):
+        filename = path.join(Settings.DATA_DIR, filename)
+    if path.exists(filename):
+        # left over from a run that did not shut down
+        os.remove(filename)
+    server = socket(AF_UNIX)
+    server.bind(filename)
+    os.chmod(filename, 0o600)
+    server.listen(4)
+    debug_output(f'Control socket listening on {filename}')
+    while True:
+        conn, _ = server.accept()
+        Thread(target=control_session, args=(conn,), daemon=True).start()
+
+
+def control_session(conn):
+    with conn, conn.makefile("rw", encoding=Settings.ENCODING) as f:
+        for line in f:
+            words = line.split()
+            if not words:
+                continue
+            command = CONTROL_COMMANDS.get(words[0].lower())
+            try:
+                if command is None:
+                    raise ValueError(f"unknown command {words[0]}, try help")
+                try:
+                    signature(command).bind(*words[1:])
+                except TypeError:
+                    raise ValueError(f"wrong arguments for {words[0]}")
+                reply = command(*words[1:]) or []
+                reply.append("ok")
+            except Exception as e:
+                # a failing command must not end the session
+                reply = [f"error {e}"]
+            f.write("\n".join(reply) + "\n")
+            f.flush()
+
+
+def control_worker(com, idle=False):
+    """
+    The worker a control command names, with idle=True it
+    must be paused with no job on the bus
+    """
+    worker = next((w for w in list(workers.values())
+                   if w.com == com or w.label == com), None)
+    if worker is None or worker.retired:
+        raise ValueError(f"no worker {com}")
+    if getattr(worker, "group", None):
+        raise ValueError(f"{com} mines for group {worker.group.com}")
+    if idle and (not worker.paused or worker.busy):
+        raise ValueError(f"pause {com} first")
+    return worker
+
+
+def control_list():
+    reply = ["worker state hashrate accepted rejected difficulty"
+             + " avr_timeout i2c_wr_rddcy poll_interval failures"]
+    for w in list(workers.values()):
+        if w.retired or getattr(w, "group", None):
+            continue
+        state = "paused" if w.paused else w.state
+        reply.append(f"{w.com} {state} {int(w.hashrate)} {w.accepted}"
+                     + f" {w.rejected} {w.difficulty_class}"
+                     + f" {getattr(w, 'avr_timeout', '-')}"
+                     + f" {getattr(w, 'wr_rddcy', '-')}"
+                     + f" {getattr(w, 'poll_interval', '-')} {w.failures}")
+    return reply
+
+
+def control_pause(com):
+    worker = control_worker(com)
+    worker.paused = True
+    hashrate_list[worker.threadid] = 0
+    # the job on the bus finishes first
+    deadline = time() + getattr(worker, "avr_timeout", 10)
+    while worker.busy and time() < deadline:
+        sleep(0.05)
+    if worker.busy:
+        return [f"{com} still busy"]
+
+
+def control_resume(com):
+    control_worker(com).paused = False
+
+
+def control_quarantine(com):
+    worker = control_worker(com)
+    worker.quarantine_requested = True
+    worker.paused = False
+
+
+def control_set(com, key, value):
+    worker = control_worker(com)
+    attr = next((attr for name, attr, _ in I2CWorker.TUNING if name == key),
+                None)
+    if worker.kind != "i2c" or attr is None:
+        raise ValueError(f"can not set {key} on {com}")
+    value = WORKER_KEYS[key](value)
+    if value <= 0:
+        raise ValueError(f"{key} must be positive")
+    setattr(worker, attr, value)
+    if key == "i2c_wr_rddcy":
+        # pinned like a [worker] override, learn() leaves it alone
+        worker.cfg = dict(worker.cfg, i2c_wr_rddcy=value)
+    return [f"{com} {key} {value}"]
+
+
+def control_probe(com):
+    worker = control_worker(com, idle=True)
+    return [f"{com} probe {'passed' if worker.probe() else 'failed'}"]
+
+
+def control_drain(com, period="1"):
+    worker = control_worker(com, idle=True)
+    worker.flush(float(period))
+
+
+def control_log(com, count="20"):
+    worker = control_worker(com)
+    return [f"{t:.3f} {diff} {nonce} {elapsed} {wall} {feedback}"
+            for t, diff, nonce, elapsed, wall, feedback
+            in list(worker.transactions)[-int(count):]]
+
+
+def control_trace(filename=None):
+    if tracer is None:
+        raise ValueError("tracing is off, set trace_file in Settings.cfg")
+    if filename:
+        filename = path.join(Settings.DATA_DIR, filename)
+    return [f"{len(tracer.events)} spans written to {tracer.export(filename)}"]
+
+
+def control_flight(com, save=None):
+    worker = control_worker(com)
+    if worker.kind == "host":
+        raise ValueError(f"{com} is not on the I2C bus")
+    members = worker.members if worker.kind == "group" else [worker]
+    reply = []
+    for member in members:
+        if save == "save":
+            reply.append(f"{member.label} written to"
+                         + f" {member.dump_flight('on request', force=True)}")
+            continue
+        if len(members) > 1:
+            reply.append(f"{member.label}:")
+        reply += i2c_bus.flight(int(member.com, base=16)).lines()
+    return reply
+
+
+def control_bus():
+    return i2c_bus.usage_lines(dict(i2c_bus.stats), time() - i2c_bus.started)
+
+
+def control_help():
+    return [" ".join(CONTROL_COMMANDS)]
+
+
+CONTROL_COMMANDS = {
+    "list":       control_list,
+    "pause":      control_pause,
+    "resume":     control_resume,
+    "quarantine": control_quarantine,
+    "set":        control_set,
+    "probe":      control_probe,
+    "drain":      control_drain,
+    "log":        control_log,
+    "bus":        control_bus,
+    "flight":     control_flight,
+    "trace":      control_trace,
+    "reload":     reload_config,
+    "help":       control_help,
+}
+
+
+def report_timer():
+    """
+    Background thread: the periodic report every periodic_report
+    seconds, on its own so a quarantined or stalled worker does
+    not hold it up
+    """
+    start_time = time()
+    last_report_share = 0
+    last_bad_crc8 = 0
+    last_i2c_retry_count = 0
+    last_compute_errors = 0
+    while not stopping:
+        sleep(1)
+        end_time = time()
+        if end_time - start_time < Settings.REPORT_TIME:
+            continue
+        pretty_print("net0", " POOL_INFO: " + Fore.RESET
+                     + Style.NORMAL + str(pool_motd), "success")
+        periodic_report(start_time, end_time, shares[0] - last_report_share,
+                        shares[2], hashrate,
+                        calculate_uptime(mining_start_time),
+                        bad_crc8 - last_bad_crc8,
+                        i2c_retry_count - last_i2c_retry_count,
+                        compute_errors - last_compute_errors)
+        start_time = end_time
+        last_report_share = shares[0]
+        last_bad_crc8 = bad_crc8
+        last_i2c_retry_count = i2c_retry_count
+        last_compute_errors = compute_errors
 
 
 def periodic_report(start_time, end_time, shares,
-                    block, hashrate, uptime, bad_crc8, i2c_retry_count):
+                    block, hashrate, uptime, bad_crc8, i2c_retry_count,
+                    compute_errors=0):
     seconds = round(end_time - start_time)
+    worker_errors = ", ".join(
+        f"{w.label}:{w.compute_errors}"
+        for w in list(workers.values()) if w.compute_errors)
+    quarantined = ", ".join(
+        f"{w.label} (probe {w.probes}, next in"
+        + f" {max(int(w.next_probe - time()), 0)}s)"
+        for w in list(workers.values()) if w.state == "quarantine")
+    fec_corrected = ", ".join(
+        f"{w.label}:{w.fec_corrected}"
+        for w in list(workers.values()) if w.fec_corrected)
+    bus_usage = i2c_bus.report(seconds)
     pretty_print("sys0",
                  " " + get_string('periodic_mining_report')
                  + Fore.RESET + Style.NORMAL
@@ -1477,7 +4256,18 @@ def periodic_report(start_time, end_time, shares,
                  + str(int(hashrate*seconds)) + get_string('report_body6')
                  + get_string('total_mining_time') + str(uptime)
                  + "\n\t\t‖ CRC8 Error Rate: " + str(round(bad_crc8/seconds, 6)) + " E/s"
-                 + "\n\t\t‖ I2C Retry Rate: " + str(round(i2c_retry_count/seconds, 6)) + " R/s", "success")
+                 + "\n\t\t‖ I2C Retry Rate: " + str(round(i2c_retry_count/seconds, 6)) + " R/s"
+                 + "\n\t\t‖ Compute Error Rate: " + str(round(compute_errors/seconds, 6)) + " E/s"
+                 + (f" ({worker_errors} total)" if worker_errors else "")
+                 + (f"\n\t\t‖ FEC Corrected Bits: {fec_corrected}"
+                    if fec_corrected else "")
+                 + (f"\n\t\t‖ Quarantined: {quarantined}"
+                    if quarantined else "")
+                 + (f"\n\t\t‖ I2C Bus Recoveries: {i2c_bus.recoveries}"
+                    + f"/{i2c_bus.recovery_attempts} attempts"
+                    if getattr(i2c_bus, "recovery_attempts", 0) else "")
+                 + "".join("\n\t\t‖ " + line for line in bus_usage),
+                 "success")
 
 
 def calculate_uptime(start_time):
@@ -1495,6 +4285,15 @@ def calculate_uptime(start_time):
 
 
 if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--replay", metavar="FILE",
+        help="serve the jobs of a record_file instead of the pool")
+    arg_parser.add_argument(
+        "--replay-speed", type=float, default=1.0, metavar="X",
+        help="replay pace relative to the recording, 0 = no pacing")
+    args = arg_parser.parse_args()
+
     init(autoreset=True)
     title(f"{get_string('duco_avr_miner')}{str(Settings.VER)})")
 
@@ -1503,6 +4302,7 @@ if __name__ == '__main__':
         
     try:
         load_config()
+        setup_logging()
         debug_output('Config file loaded')
     except Exception as e:
         pretty_print(
@@ -1513,17 +4313,47 @@ if __name__ == '__main__':
         sleep(10)
         _exit(1)
 
+    load_state()
+
     try:
         greeting()
         debug_output('Greeting displayed')
     except Exception as e:
         debug_output(f'Error displaying greeting message: {e}')
 
-    try:
-        check_mining_key(config)
-    except Exception as e:
-        debug_output(f'Error checking miner key: {e}')
-        
+    if args.replay:
+        try:
+            replay = ReplayPool(args.replay, args.replay_speed)
+        except Exception as e:
+            pretty_print('sys0', f' Can not load replay file {args.replay} ({e})',
+                         'error')
+            _exit(1)
+        pretty_print('sys0', f' Replaying {replay.total} jobs from {args.replay}'
+                     + f' at {args.replay_speed}x', 'success')
+        # no network, no donation, no discord while replaying
+        donation_level = 0
+        discord_presence = "n"
+    else:
+        try:
+            check_mining_key(config)
+        except Exception as e:
+            debug_output(f'Error checking miner key: {e}')
+
+    if Settings.SHARE_LOG != "None":
+        share_log = ShareLog(path.join(Settings.DATA_DIR, Settings.SHARE_LOG))
+
+    if Settings.TRACE_FILE != "None":
+        tracer = Tracer(path.join(Settings.DATA_DIR, Settings.TRACE_FILE),
+                        Settings.TRACE_EVENTS)
+
+    if Settings.RECORD_FILE != "None":
+        try:
+            recorder = Recorder(path.join(Settings.DATA_DIR,
+                                          Settings.RECORD_FILE))
+            debug_output(f'Recording jobs to {recorder.filename}')
+        except Exception as e:
+            debug_output(f'Error opening record file: {e}')
+
     if donation_level > 0:
         try:
             Donate.load(donation_level)
@@ -1531,18 +4361,43 @@ if __name__ == '__main__':
         except Exception as e:
             debug_output(f'Error launching donation thread: {e}')
 
+    start_console()
+
     try:
-        i2c_bus = SMBus(i2c)
+        i2c_bus = I2CBus(i2c)
+        if Settings.HOST_WORKERS > 0:
+            # leave one core to the bus-servicing threads
+            host_cores = min(Settings.HOST_WORKERS,
+                             max(1, (os.cpu_count() or 1) - 1))
+            # the pool processes start on the first job, when the
+            # mining and console threads run: never fork this process
+            host_pool = ProcessPoolExecutor(
+                max_workers=host_cores, initializer=host_pool_init,
+                mp_context=get_context("spawn" if osname == "nt"
+                                       else "forkserver"))
+            hashrate_list += [0] * host_cores
         fastest_pool = Client.fetch_pool()
         threadid = 0
         if Settings.WORKER_CFG_SHARED == "y":
             for port in avrport:
                 get_worker_cfg_global(i2c_bus,port)
                 if worker_cfg_global["valid"]: break
+        split_groups = []
+        if Settings.NONCE_SPLIT_GROUPS != "None":
+            for group in Settings.NONCE_SPLIT_GROUPS.split(","):
+                group = [com for com in group.split("+") if com in avrport]
+                if len(group) > 1:
+                    split_groups.append(group)
         for port in avrport:
-            Thread(target=mine_avr,
-                   args=(port, threadid,
-                         fastest_pool, rig_identifier[threadid])).start()
+            group = next((g for g in split_groups if port in g), None)
+            if group is None:
+                Thread(target=mine_avr,
+                       args=(port, threadid,
+                             fastest_pool, rig_identifier[threadid])).start()
+            elif port == group[0]:
+                Thread(target=mine_group,
+                       args=([(com, avrport.index(com)) for com in group],
+                             fastest_pool, rig_identifier[threadid])).start()
             threadid += 1
             if ((len(avrport) > 1) and (threadid != len(avrport))):
                 pretty_print('sys' + str(threadid),
@@ -1555,6 +4410,25 @@ if __name__ == '__main__':
                 pretty_print('sys' + str(threadid),
                                 f" All {threadid}/{len(avrport)} worker(s) started",
                                 "success")
+        if host_pool:
+            for cpu in range(host_cores):
+                Thread(target=mine_host,
+                       args=(f"cpu{cpu}", threadid, fastest_pool,
+                             Settings.HOST_IDENTIFIER)).start()
+                threadid += 1
+            pretty_print('sys0',
+                         f" Started {host_cores} host CPU worker(s)"
+                         + f" at {Settings.HOST_CPU_BUDGET}% CPU budget each",
+                         "success")
+        Thread(target=report_timer, daemon=True).start()
+        if Settings.HOTPLUG_SCAN > 0:
+            Thread(target=hotplug_scan,
+                   args=(fastest_pool, rig_identifier[0]), daemon=True).start()
+        if osname != "nt":
+            from signal import SIGHUP
+            signal(SIGHUP, reload_handler)
+        if Settings.CONTROL_SOCKET != "None":
+            Thread(target=control_server, daemon=True).start()
     except Exception as e:
         debug_output(f'Error launching AVR thread(s): {e}')
 
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+RPI I2C Unofficial AVR Miner share log analyzer © MIT licensed
+Reads the share_log written by AVR_Miner_RPI.py and reports
+per worker and per rig efficiency over its whole history
+
+Usage: python3 AVR_Miner_RPI_Analyzer.py [share log files]
+
+Full credit belong to
+https://duinocoin.com
+https://github.com/revoxhere/duino-coin
+Duino-Coin Team & Community 2019-current
+"""
+
+from argparse import ArgumentParser
+from collections import Counter
+from glob import glob
+from os import path
+from time import localtime, strftime, time
+import csv
+import statistics
+import sys
+
+try:
+    # optional, the pure python fallback gives the same numbers slower
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_DIR = "Duino-Coin AVR Miner 4.3"
+ACCEPTED = ("GOOD", "BLOCK")
+COLUMNS = ("time", "worker", "job", "diff", "nonce", "compute_us", "hashrate",
+           "rtt_ms", "feedback", "reason", "retries", "temperature", "rig",
+           "crc_errors", "compute_errors")
+NUMERIC = ("time", "diff", "nonce", "compute_us", "hashrate", "rtt_ms",
+           "retries", "temperature", "crc_errors", "compute_errors")
+
+
+def load(files):
+    """
+    Columns of all share logs by name, numeric columns as float
+    arrays (NaN where empty), the others as string arrays
+    """
+    rows = []
+    for filename in files:
+        with open(filename, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                continue
+            # logs written before a column was added lack it
+            index = [header.index(name) if name in header else None
+                     for name in COLUMNS]
+            for row in reader:
+                rows.append([row[i] if i is not None and i < len(row) else ""
+                             for i in index])
+    if not rows:
+        return {}
+
+    columns = {}
+    for name, values in zip(COLUMNS, zip(*rows)):
+        if name in NUMERIC:
+            values = [float(v) if v not in ("", "-") else float("nan")
+                      for v in values]
+        columns[name] = np.array(values) if np else list(values)
+    # rotated files are read in any order
+    if np:
+        order = np.argsort(columns["time"], kind="stable")
+        return {name: values[order] for name, values in columns.items()}
+    order = sorted(range(len(rows)), key=columns["time"].__getitem__)
+    return {name: [values[i] for i in order] for name, values in columns.items()}
+
+
+def select(columns, mask):
+    if np:
+        return {name: values[mask] for name, values in columns.items()}
+    return {name: [v for v, m in zip(values, mask) if m]
+            for name, values in columns.items()}
+
+
+def equal(values, value):
+    if np:
+        return values == value
+    return [v == value for v in values]
+
+
+def finite(values):
+    if np:
+        return values[~np.isnan(values)]
+    return [v for v in values if v == v]
+
+
+def median(values):
+    values = finite(values)
+    if not len(values):
+        return float("nan")
+    return float(np.median(values)) if np else statistics.median(values)
+
+
+def percentile(values, q):
+    values = finite(values)
+    if not len(values):
+        return float("nan")
+    if np:
+        return float(np.percentile(values, q))
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def pairs(x, y):
+    # x and y where both are set
+    if np:
+        keep = ~(np.isnan(x) | np.isnan(y))
+        return x[keep], y[keep]
+    both = [(a, b) for a, b in zip(x, y) if a == a and b == b]
+    return [a for a, _ in both], [b for _, b in both]
+
+
+def slope(x, y):
+    """
+    Least squares slope of y over x
+    """
+    x, y = pairs(x, y)
+    if len(x) < 2 or max(x) == min(x):
+        return float("nan")
+    if np:
+        return float(np.polyfit(x, y, 1)[0])
+    mx, my = statistics.fmean(x), statistics.fmean(y)
+    return (sum((a - mx) * (b - my) for a, b in zip(x, y))
+            / sum((a - mx) ** 2 for a in x))
+
+
+def correlation(x, y):
+    x, y = pairs(x, y)
+    if len(x) < 3 or max(x) == min(x) or max(y) == min(y):
+        return float("nan")
+    if np:
+        return float(np.corrcoef(x, y)[0, 1])
+    mx, my = statistics.fmean(x), statistics.fmean(y)
+    sxy = sum((a - mx) * (b - my) for a, b in zip(x, y))
+    sxx = sum((a - mx) ** 2 for a in x)
+    syy = sum((b - my) ** 2 for b in y)
+    return sxy / (sxx * syy) ** 0.5
+
+
+def total(values):
+    values = finite(values)
+    return float(np.sum(values)) if np else sum(values)
+
+
+def span(values):
+    values = finite(values)
+    if not len(values):
+        return 0
+    return float(max(values) - min(values))
+
+
+def increase(values):
+    """
+    Growth of a running total, a drop means the miner restarted
+    and counts again from zero
+    """
+    values = finite(values)
+    if np:
+        steps = np.diff(values)
+        return float(np.sum(np.where(steps >= 0, steps, values[1:])))
+    return sum(b - a if b >= a else b for a, b in zip(values, values[1:]))
+
+
+def errors(columns, name):
+    # running totals are per worker, a rig adds up its workers
+    return sum(increase(select(columns, equal(columns["worker"], worker))[name])
+               for worker in set(columns["worker"]))
+
+
+def fmt(value, digits=2):
+    if value != value:
+        return "-"
+    return f"{value:.{digits}f}"
+
+
+def report(title, columns):
+    """
+    Efficiency figures of one worker or rig
+    """
+    times = columns["time"]
+    shares = len(times)
+    hours = max(span(times) / 3600, 1 / 3600)
+    accepted = sum(1 for f in columns["feedback"] if f in ACCEPTED)
+    rejected = shares - accepted
+    lines = [f"{title}: {shares} shares over {fmt(hours, 1)} h,"
+             + f" {fmt(accepted / hours, 1)} accepted/h,"
+             + f" reject ratio {fmt(rejected / shares * 100, 2)}%"]
+
+    if rejected:
+        reasons = Counter(
+            f"{feedback} {reason}".strip() for feedback, reason
+            in zip(columns["feedback"], columns["reason"])
+            if feedback not in ACCEPTED)
+        lines.append("  rejects: " + ", ".join(
+            f"{reason} {count} ({fmt(count / shares * 100)}%)"
+            for reason, count in reasons.most_common(5)))
+
+    lines.append("  difficulty  shares  compute median  p90      hashes/s")
+    diffs = finite(columns["diff"])
+    for diff in sorted(set(float(d) for d in diffs)):
+        part = select(columns, equal(columns["diff"], diff))
+        compute = part["compute_us"]
+        if np:
+            rate = part["nonce"] / np.maximum(compute, 1) * 1000000
+        else:
+            rate = [n / max(c, 1) * 1000000 for n, c in zip(part["nonce"], compute)]
+        lines.append(f"  {int(diff):<10}  {len(compute):<6}"
+                     + f"  {fmt(median(compute) / 1000000, 3) + ' s':<14}"
+                     + f"  {fmt(percentile(compute, 90) / 1000000, 3) + ' s':<7}"
+                     + f"  {fmt(median(rate), 0)}")
+
+    # H/s per day, and the last tenth of the shares against the first
+    drift = slope(times, columns["hashrate"]) * 86400
+    tenth = max(shares // 10, 1)
+    first = median(columns["hashrate"][:tenth])
+    last = median(columns["hashrate"][-tenth:])
+    lines.append(f"  hashrate median {fmt(median(columns['hashrate']), 0)} H/s,"
+                 + f" drift {fmt(drift, 1)} H/s per day"
+                 + f" (first 10% {fmt(first, 0)}, last 10% {fmt(last, 0)})")
+
+    retries = total(columns["retries"])
+    line = (f"  retries {fmt(retries / shares, 3)}/share,"
+            + f" rtt median {fmt(median(columns['rtt_ms']), 0)} ms")
+    line += (f", crc8 errors {fmt(errors(columns, 'crc_errors') / hours, 2)}/h,"
+             + " compute errors"
+             + f" {fmt(errors(columns, 'compute_errors') / hours, 2)}/h")
+    lines.append(line)
+
+    temperature = finite(columns["temperature"])
+    if len(temperature):
+        lines.append(f"  temperature median {fmt(median(temperature), 1)},"
+                     + " correlation with hashrate"
+                     + f" {fmt(correlation(columns['temperature'], columns['hashrate']))}")
+    return lines
+
+
+def main():
+    parser = ArgumentParser(description="Report on a share_log of"
+                            + " AVR_Miner_RPI.py")
+    parser.add_argument(
+        "files", nargs="*",
+        help="share log files, default the shares.csv* files of the data folder")
+    parser.add_argument("--hours", type=float, default=0,
+                        help="only the last HOURS of the log, 0 = all")
+    parser.add_argument("--worker", action="append",
+                        help="only these workers, e.g. avr08")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob(path.join(DATA_DIR, "shares.csv*")))
+    if not files:
+        print("No share log found, set share_log in Settings.cfg")
+        sys.exit(1)
+
+    start = time()
+    columns = load(files)
+    if not columns:
+        print("The share log is empty")
+        sys.exit(1)
+    if args.hours:
+        if np:
+            mask = columns["time"] >= time() - args.hours * 3600
+        else:
+            mask = [t >= time() - args.hours * 3600 for t in columns["time"]]
+        columns = select(columns, mask)
+    if args.worker:
+        mask = [w in args.worker for w in columns["worker"]]
+        columns = select(columns, np.array(mask, dtype=bool) if np else mask)
+    if not len(columns["time"]):
+        print("No shares match")
+        sys.exit(1)
+
+    print(f"{len(columns['time'])} shares from {len(files)} file(s),"
+          + f" {strftime('%Y-%m-%d %H:%M', localtime(columns['time'][0]))} to"
+          + f" {strftime('%Y-%m-%d %H:%M', localtime(columns['time'][-1]))},"
+          + f" loaded in {fmt(time() - start, 2)} s"
+          + ("" if np else " (install numpy for large logs)"))
+
+    for column in ("rig", "worker"):
+        for name in sorted(set(columns[column])):
+            print()
+            print("\n".join(report(f"{column} {name or '-'}",
+                                   select(columns, equal(columns[column], name)))))
+
+
+if __name__ == "__main__":
+    main()
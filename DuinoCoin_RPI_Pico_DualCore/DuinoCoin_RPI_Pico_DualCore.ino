@@ -85,6 +85,15 @@ static bool wdt_pet = true;
 static uint16_t wdt_period_half = WDT_PERIOD/2;
 // 40+40+20+3 is the maximum size of a job
 const uint16_t job_maxsize = 104;
+// job line as parsed by parse_job()
+struct duco_job {
+  String lastblockhash;
+  String newblockhash;
+  uint32_t difficulty;
+  uint32_t nonce_start;
+  uint32_t nonce_end;
+  int32_t seq;
+};
 byte i2c1_addr=0;
 bool core0_started = false, core1_started = false;
 uint32_t core0_shares = 0, core0_shares_ss = 0, core0_shares_local = 0;
@@ -18,6 +18,12 @@
 StreamString core0_bufferReceive;
 StreamString core0_bufferRequest;
 Sha1Wrapper core0_Sha1_base;
+// set by an empty line or set,abort$ arriving while a job is hashed
+volatile bool core0_preempt = false;
+volatile bool core0_abort = false;
+volatile char core0_last_rx = 0;
+// kept for set,xmit$
+String core0_last_result;
 
 void core0_setup_i2c() {
   byte addr = 2 * DEV_INDEX + I2CS_START_ADDRESS;
@@ -53,7 +59,14 @@ byte core0_find_i2c() {
 
 void core0_receiveEvent(int howMany) {
   if (howMany == 0) return;
-  core0_bufferReceive.write(I2C0.read());
+  char c = I2C0.read();
+  core0_bufferReceive.write(c);
+  if (c == '\n' && core0_last_rx == '\n') core0_preempt = true;
+  else if (c == '$' && core0_bufferReceive.indexOf("set,a") != -1) {
+    core0_abort = true;
+    core0_preempt = true;
+  }
+  core0_last_rx = c;
   while (I2C0.available()) I2C0.read();
 }
 
@@ -79,10 +92,23 @@ void core0_send(String data) {
   core0_bufferRequest.print(DUMMY_DATA + data + "\n");
 }
 
+// true when a $ terminated command comes before the next job line
+bool core0_cmd_first() {
+  int cmd_end = core0_bufferReceive.indexOf('$');
+  int line_end = core0_bufferReceive.indexOf('\n');
+  return cmd_end != -1 && (line_end == -1 || cmd_end < line_end);
+}
+
 bool core0_loop() {
 
-  if (core0_bufferReceive.available() > 0 && 
-      core0_bufferReceive.indexOf("$") != -1) {
+  if (core0_abort) {
+    // drop the jobs queued ahead of set,abort$
+    core0_abort = false;
+    int abort_at = core0_bufferReceive.indexOf("set,a");
+    for (int i = 0; i < abort_at; i++) core0_bufferReceive.read();
+  }
+
+  if (core0_bufferReceive.available() > 0 && core0_cmd_first()) {
     String action = core0_bufferReceive.readStringUntil(',');
     String field  = core0_bufferReceive.readStringUntil('$');
     String response;
@@ -115,6 +141,26 @@ bool core0_loop() {
           response = String(SINGLE_CORE_ONLY);
           printMsg("core0 SINGLE_CORE_ONLY: ");
           break;
+        case 'r' : // nonce range field in job line
+          response = "1";
+          printMsg("core0 nonce range: ");
+          break;
+        case 'a' : // set,abort support
+          response = "1";
+          printMsg("core0 abort: ");
+          break;
+        case 'q' : // job queue, i<seq> field in job line
+          response = "1";
+          printMsg("core0 job queue: ");
+          break;
+        case 'x' : // set,xmit$ support
+          response = "1";
+          printMsg("core0 retransmit: ");
+          break;
+        case 'e' : // FEC framed job lines and results
+          response = "1";
+          printMsg("core0 ecc: ");
+          break;
         case 'n' : // worker name
           response = String(WORKER_NAME);
           printMsg("WORKER_NAME: ");
@@ -128,7 +174,24 @@ bool core0_loop() {
       core0_send(response + "$");
     }
     else if (action == "set") {
-      // not used at the moment
+      switch (tolower(field[0])) {
+        case 'a': // abort, the job in progress was preempted already
+          while (core0_bufferRequest.available()) core0_bufferRequest.read();
+          response = "ok";
+          printMsg("core0 job aborted: ");
+          break;
+        case 'x': // the last result went bad on the bus, send it again
+          while (core0_bufferRequest.available()) core0_bufferRequest.read();
+          core0_send(core0_last_result);
+          printMsgln("core0 result resent: " + core0_last_result);
+          return false;
+        default:
+          response = "unkn";
+          printMsgln("core0 command: " + field);
+          printMsg("core0 response: ");
+      }
+      printMsgln(response);
+      core0_send(response + "$");
     }
     if (WDT_EN && wdt_pet) {
       watchdog_update();
@@ -138,59 +201,74 @@ bool core0_loop() {
   // do work here
   if (core0_bufferReceive.available() > 0 && core0_bufferReceive.indexOf('\n') != -1) {
 
-    if (core0_bufferReceive.available() > 0 && 
-      core0_bufferReceive.indexOf("$") != -1) {
+    if (core0_bufferReceive.available() > 0 && core0_cmd_first()) {
       core0_bufferReceive.readStringUntil('$');
     }
     
-    printMsg("core0 job recv : " + core0_bufferReceive);
-    
-    // Read last block hash
-    String lastblockhash = core0_bufferReceive.readStringUntil(',');
-    // Read expected hash
-    String newblockhash = core0_bufferReceive.readStringUntil(',');
+    String line = core0_bufferReceive.readStringUntil('\n');
+    printMsgln("core0 job recv : " + line);
 
-    unsigned int difficulty;
-    if (CRC8_EN) {
-      difficulty = core0_bufferReceive.readStringUntil(',').toInt();
-      uint8_t received_crc8 = core0_bufferReceive.readStringUntil('\n').toInt();
-      String data = lastblockhash + "," + newblockhash + "," + String(difficulty) + ",";
-      uint8_t expected_crc8 = calc_crc8(data);
+    // an empty line cancels the job, drop a result still queued
+    if (line.length() == 0) {
+      while (core0_bufferRequest.available()) core0_bufferRequest.read();
+      return false;
+    }
 
-      if (received_crc8 != expected_crc8) {
+    // FEC framed job line, corrected in place
+    int8_t ecc = -1;
+    if (fec_start(line[0])) {
+      ecc = fec_decode(line);
+      if (ecc < 0) {
         core0_abort_loop();
         return false;
       }
     }
-    else {
-      // Read difficulty
-      difficulty = core0_bufferReceive.readStringUntil('\n').toInt();
+
+    duco_job job;
+    if (!parse_job(line, job)) {
+      core0_abort_loop();
+      return false;
     }
 
-    // clear in case of excessive jobs
-    while (core0_bufferReceive.available() > 0 && core0_bufferReceive.indexOf('\n') != -1) {
+    // clear in case of excessive jobs, queue mode keeps them for later
+    while (job.seq < 0 && core0_bufferReceive.available() > 0 && core0_bufferReceive.indexOf('\n') != -1) {
       core0_bufferReceive.readStringUntil('\n');
     }
 
+    // any line from here on supersedes this job
+    core0_preempt = false;
     // Start time measurement
     unsigned long startTime = micros();
     // Call DUCO-S1A hasher
     unsigned int ducos1result = 0;
-    if (difficulty < DIFF_MAX) ducos1result = core0_ducos1a(lastblockhash, newblockhash, difficulty);
+    if (job.difficulty < DIFF_MAX) ducos1result = core0_ducos1a(job.lastblockhash, job.newblockhash, job.nonce_start, job.nonce_end);
     // End time measurement
     unsigned long endTime = micros();
     // Calculate elapsed time
     unsigned long elapsedTime = endTime - startTime;
+    if (core0_preempt) {
+      // the host has moved on, nobody reads this result
+      printMsgln("core0 job preempted");
+      return false;
+    }
     // Send result back to the program with share time
-    while (core0_bufferRequest.available()) core0_bufferRequest.read();
+    // queue mode appends, the host may not have read the previous one yet
+    if (job.seq < 0) {
+      while (core0_bufferRequest.available()) core0_bufferRequest.read();
+    }
 
     String result = String(ducos1result) + "," + String(elapsedTime) + "," + String(DUCOID);
+    if (job.seq >= 0) result += ",i" + String(job.seq);
+    // tell the host a bit of the job line was corrected
+    if (ecc > 0) result += ",e" + String(ecc);
 
     // calculate crc8 for result
     if (CRC8_EN) {
       result += ",";
       result += String(calc_crc8(result));
     }
+    if (ecc >= 0) result = fec_encode(result);
+    core0_last_result = result;
     core0_send(result);
     // prepend non-alnum data (to be discarded in py) for improved data integrity
     //core0_bufferRequest.print("   " + result + "\n");
@@ -202,7 +280,7 @@ bool core0_loop() {
 
 // DUCO-S1A hasher from Revox
 uint32_t core0_ducos1a(String lastblockhash, String newblockhash,
-                 uint32_t difficulty) {
+                 uint32_t nonce_start, uint32_t nonce_end) {
   
   uint8_t job[job_maxsize];
   newblockhash.toUpperCase();
@@ -214,7 +292,8 @@ uint32_t core0_ducos1a(String lastblockhash, String newblockhash,
   // Difficulty loop
   core0_Sha1_base.init();
   core0_Sha1_base.print(lastblockhash);
-  for (uint32_t ducos1res = 0; ducos1res < difficulty * 100 + 1; ducos1res++) {
+  for (uint32_t ducos1res = nonce_start; ducos1res <= nonce_end; ducos1res++) {
+    if (core0_preempt) return 0;
     core0_Sha1 = core0_Sha1_base;
     core0_Sha1.print(String(ducos1res));
     // Get SHA1 result
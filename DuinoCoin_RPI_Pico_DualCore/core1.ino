@@ -18,6 +18,12 @@
 StreamString core1_bufferReceive;
 StreamString core1_bufferRequest;
 Sha1Wrapper core1_Sha1_base;
+// set by an empty line or set,abort$ arriving while a job is hashed
+volatile bool core1_preempt = false;
+volatile bool core1_abort = false;
+volatile char core1_last_rx = 0;
+// kept for set,xmit$
+String core1_last_result;
 
 void core1_setup_i2c() {
   byte addr = 2 * DEV_INDEX + I2CS_START_ADDRESS + 1;
@@ -51,7 +57,14 @@ byte core1_find_i2c() {
 
 void core1_receiveEvent(int howMany) {
   if (howMany == 0) return;
-  core1_bufferReceive.write(I2C1.read());
+  char c = I2C1.read();
+  core1_bufferReceive.write(c);
+  if (c == '\n' && core1_last_rx == '\n') core1_preempt = true;
+  else if (c == '$' && core1_bufferReceive.indexOf("set,a") != -1) {
+    core1_abort = true;
+    core1_preempt = true;
+  }
+  core1_last_rx = c;
   while (I2C1.available()) I2C1.read();
 }
 
@@ -77,10 +90,23 @@ void core1_send(String data) {
   core1_bufferRequest.print(DUMMY_DATA + data + "\n");
 }
 
+// true when a $ terminated command comes before the next job line
+bool core1_cmd_first() {
+  int cmd_end = core1_bufferReceive.indexOf('$');
+  int line_end = core1_bufferReceive.indexOf('\n');
+  return cmd_end != -1 && (line_end == -1 || cmd_end < line_end);
+}
+
 bool core1_loop() {
 
-  if (core1_bufferReceive.available() > 0 && 
-      core1_bufferReceive.indexOf("$") != -1) {
+  if (core1_abort) {
+    // drop the jobs queued ahead of set,abort$
+    core1_abort = false;
+    int abort_at = core1_bufferReceive.indexOf("set,a");
+    for (int i = 0; i < abort_at; i++) core1_bufferReceive.read();
+  }
+
+  if (core1_bufferReceive.available() > 0 && core1_cmd_first()) {
     String action = core1_bufferReceive.readStringUntil(',');
     String field  = core1_bufferReceive.readStringUntil('$');
     String response;
@@ -113,6 +139,26 @@ bool core1_loop() {
           response = String(SINGLE_CORE_ONLY);
           printMsg("core1 SINGLE_CORE_ONLY: ");
           break;
+        case 'r' : // nonce range field in job line
+          response = "1";
+          printMsg("core1 nonce range: ");
+          break;
+        case 'a' : // set,abort support
+          response = "1";
+          printMsg("core1 abort: ");
+          break;
+        case 'q' : // job queue, i<seq> field in job line
+          response = "1";
+          printMsg("core1 job queue: ");
+          break;
+        case 'x' : // set,xmit$ support
+          response = "1";
+          printMsg("core1 retransmit: ");
+          break;
+        case 'e' : // FEC framed job lines and results
+          response = "1";
+          printMsg("core1 ecc: ");
+          break;
         case 'n' : // worker name
           response = String(WORKER_NAME);
           printMsg("WORKER_NAME: ");
@@ -126,7 +172,24 @@ bool core1_loop() {
       core1_send(response + "$");
     }
     else if (action == "set") {
-      // not used at the moment
+      switch (tolower(field[0])) {
+        case 'a': // abort, the job in progress was preempted already
+          while (core1_bufferRequest.available()) core1_bufferRequest.read();
+          response = "ok";
+          printMsg("core1 job aborted: ");
+          break;
+        case 'x': // the last result went bad on the bus, send it again
+          while (core1_bufferRequest.available()) core1_bufferRequest.read();
+          core1_send(core1_last_result);
+          printMsgln("core1 result resent: " + core1_last_result);
+          return false;
+        default:
+          response = "unkn";
+          printMsgln("core1 command: " + field);
+          printMsg("core1 response: ");
+      }
+      printMsgln(response);
+      core1_send(response + "$");
     }
     if (WDT_EN && wdt_pet) {
       watchdog_update();
@@ -136,59 +199,74 @@ bool core1_loop() {
   // do work here
   if (core1_bufferReceive.available() > 0 && core1_bufferReceive.indexOf('\n') != -1) {
 
-    if (core1_bufferReceive.available() > 0 && 
-      core1_bufferReceive.indexOf("$") != -1) {
+    if (core1_bufferReceive.available() > 0 && core1_cmd_first()) {
       core1_bufferReceive.readStringUntil('$');
     }
 
-    printMsg("core1 job recv : " + core1_bufferReceive);
-    
-    // Read last block hash
-    String lastblockhash = core1_bufferReceive.readStringUntil(',');
-    // Read expected hash
-    String newblockhash = core1_bufferReceive.readStringUntil(',');
+    String line = core1_bufferReceive.readStringUntil('\n');
+    printMsgln("core1 job recv : " + line);
 
-    unsigned int difficulty;
-    if (CRC8_EN) {
-      difficulty = core1_bufferReceive.readStringUntil(',').toInt();
-      uint8_t received_crc8 = core1_bufferReceive.readStringUntil('\n').toInt();
-      String data = lastblockhash + "," + newblockhash + "," + String(difficulty) + ",";
-      uint8_t expected_crc8 = calc_crc8(data);
-      
-      if (received_crc8 != expected_crc8) {
-          core1_abort_loop();
-          return false;
+    // an empty line cancels the job, drop a result still queued
+    if (line.length() == 0) {
+      while (core1_bufferRequest.available()) core1_bufferRequest.read();
+      return false;
+    }
+
+    // FEC framed job line, corrected in place
+    int8_t ecc = -1;
+    if (fec_start(line[0])) {
+      ecc = fec_decode(line);
+      if (ecc < 0) {
+        core1_abort_loop();
+        return false;
       }
     }
-    else {
-      // Read difficulty
-      difficulty = core1_bufferReceive.readStringUntil('\n').toInt();
+
+    duco_job job;
+    if (!parse_job(line, job)) {
+      core1_abort_loop();
+      return false;
     }
 
-    // clear in case of excessive jobs
-    while (core1_bufferReceive.available() > 0 && core1_bufferReceive.indexOf('\n') != -1) {
+    // clear in case of excessive jobs, queue mode keeps them for later
+    while (job.seq < 0 && core1_bufferReceive.available() > 0 && core1_bufferReceive.indexOf('\n') != -1) {
       core1_bufferReceive.readStringUntil('\n');
     }
     
+    // any line from here on supersedes this job
+    core1_preempt = false;
     // Start time measurement
     unsigned long startTime = micros();
     // Call DUCO-S1A hasher
     unsigned int ducos1result = 0;
-    if (difficulty < DIFF_MAX) ducos1result = core1_ducos1a(lastblockhash, newblockhash, difficulty);
+    if (job.difficulty < DIFF_MAX) ducos1result = core1_ducos1a(job.lastblockhash, job.newblockhash, job.nonce_start, job.nonce_end);
     // End time measurement
     unsigned long endTime = micros();
     // Calculate elapsed time
     unsigned long elapsedTime = endTime - startTime;
+    if (core1_preempt) {
+      // the host has moved on, nobody reads this result
+      printMsgln("core1 job preempted");
+      return false;
+    }
     // Send result back to the program with share time
-    while (core1_bufferRequest.available()) core1_bufferRequest.read();
+    // queue mode appends, the host may not have read the previous one yet
+    if (job.seq < 0) {
+      while (core1_bufferRequest.available()) core1_bufferRequest.read();
+    }
 
     String result = String(ducos1result) + "," + String(elapsedTime) + "," + String(DUCOID);
+    if (job.seq >= 0) result += ",i" + String(job.seq);
+    // tell the host a bit of the job line was corrected
+    if (ecc > 0) result += ",e" + String(ecc);
 
     // calculate crc8 for result
     if (CRC8_EN) {
       result += ",";
       result += String(calc_crc8(result));
     }
+    if (ecc >= 0) result = fec_encode(result);
+    core1_last_result = result;
     core1_send(result);
     // prepend non-alnum data (to be discarded in py) for improved data integrity
     //core1_bufferRequest.print("   " + result + "\n");
@@ -200,7 +278,7 @@ bool core1_loop() {
 
 // DUCO-S1A hasher from Revox
 uint32_t core1_ducos1a(String lastblockhash, String newblockhash,
-                 uint32_t difficulty) {
+                 uint32_t nonce_start, uint32_t nonce_end) {
   // 40+40+20+3 is the maximum size of a job
   //const uint16_t job_maxsize = 104;  
   uint8_t job[job_maxsize];
@@ -214,7 +292,8 @@ uint32_t core1_ducos1a(String lastblockhash, String newblockhash,
   // Difficulty loop
   core1_Sha1_base.init();
   core1_Sha1_base.print(lastblockhash);
-  for (uint32_t ducos1res = 0; ducos1res < difficulty * 100 + 1; ducos1res++) {
+  for (uint32_t ducos1res = nonce_start; ducos1res <= nonce_end; ducos1res++) {
+    if (core1_preempt) return 0;
     core1_Sha1 = core1_Sha1_base;
     core1_Sha1.print(String(ducos1res));
     // Get SHA1 result
@@ -24,26 +24,133 @@
 #endif
 
 // https://stackoverflow.com/questions/51731313/cross-platform-crc8-function-c-and-python-parity-check
+// table driven version of the bitwise Dallas/Maxim CRC8 (reflected 0x8C)
+static const uint8_t crc8_table[256] = {
+  0x00, 0x5E, 0xBC, 0xE2, 0x61, 0x3F, 0xDD, 0x83, 0xC2, 0x9C, 0x7E, 0x20, 0xA3, 0xFD, 0x1F, 0x41,
+  0x9D, 0xC3, 0x21, 0x7F, 0xFC, 0xA2, 0x40, 0x1E, 0x5F, 0x01, 0xE3, 0xBD, 0x3E, 0x60, 0x82, 0xDC,
+  0x23, 0x7D, 0x9F, 0xC1, 0x42, 0x1C, 0xFE, 0xA0, 0xE1, 0xBF, 0x5D, 0x03, 0x80, 0xDE, 0x3C, 0x62,
+  0xBE, 0xE0, 0x02, 0x5C, 0xDF, 0x81, 0x63, 0x3D, 0x7C, 0x22, 0xC0, 0x9E, 0x1D, 0x43, 0xA1, 0xFF,
+  0x46, 0x18, 0xFA, 0xA4, 0x27, 0x79, 0x9B, 0xC5, 0x84, 0xDA, 0x38, 0x66, 0xE5, 0xBB, 0x59, 0x07,
+  0xDB, 0x85, 0x67, 0x39, 0xBA, 0xE4, 0x06, 0x58, 0x19, 0x47, 0xA5, 0xFB, 0x78, 0x26, 0xC4, 0x9A,
+  0x65, 0x3B, 0xD9, 0x87, 0x04, 0x5A, 0xB8, 0xE6, 0xA7, 0xF9, 0x1B, 0x45, 0xC6, 0x98, 0x7A, 0x24,
+  0xF8, 0xA6, 0x44, 0x1A, 0x99, 0xC7, 0x25, 0x7B, 0x3A, 0x64, 0x86, 0xD8, 0x5B, 0x05, 0xE7, 0xB9,
+  0x8C, 0xD2, 0x30, 0x6E, 0xED, 0xB3, 0x51, 0x0F, 0x4E, 0x10, 0xF2, 0xAC, 0x2F, 0x71, 0x93, 0xCD,
+  0x11, 0x4F, 0xAD, 0xF3, 0x70, 0x2E, 0xCC, 0x92, 0xD3, 0x8D, 0x6F, 0x31, 0xB2, 0xEC, 0x0E, 0x50,
+  0xAF, 0xF1, 0x13, 0x4D, 0xCE, 0x90, 0x72, 0x2C, 0x6D, 0x33, 0xD1, 0x8F, 0x0C, 0x52, 0xB0, 0xEE,
+  0x32, 0x6C, 0x8E, 0xD0, 0x53, 0x0D, 0xEF, 0xB1, 0xF0, 0xAE, 0x4C, 0x12, 0x91, 0xCF, 0x2D, 0x73,
+  0xCA, 0x94, 0x76, 0x28, 0xAB, 0xF5, 0x17, 0x49, 0x08, 0x56, 0xB4, 0xEA, 0x69, 0x37, 0xD5, 0x8B,
+  0x57, 0x09, 0xEB, 0xB5, 0x36, 0x68, 0x8A, 0xD4, 0x95, 0xCB, 0x29, 0x77, 0xF4, 0xAA, 0x48, 0x16,
+  0xE9, 0xB7, 0x55, 0x0B, 0x88, 0xD6, 0x34, 0x6A, 0x2B, 0x75, 0x97, 0xC9, 0x4A, 0x14, 0xF6, 0xA8,
+  0x74, 0x2A, 0xC8, 0x96, 0x15, 0x4B, 0xA9, 0xF7, 0xB6, 0xE8, 0x0A, 0x54, 0xD7, 0x89, 0x6B, 0x35
+};
+
+uint8_t crc8_update(uint8_t crc, const uint8_t *addr, size_t len) {
+  while (len--) crc = crc8_table[crc ^ *addr++];
+  return crc;
+}
+
 uint8_t crc8( uint8_t *addr, uint8_t len) {
-      uint8_t crc=0;
-      for (uint8_t i=0; i<len;i++) {
-         uint8_t inbyte = addr[i];
-         for (uint8_t j=0;j<8;j++) {
-             uint8_t mix = (crc ^ inbyte) & 0x01;
-             crc >>= 1;
-             if (mix) 
-                crc ^= 0x8C;
-         inbyte >>= 1;
-      }
-    }
-   return crc;
+  return crc8_update(0, addr, len);
 }
 
 uint8_t calc_crc8( String msg ) {
-    int msg_len = msg.length() + 1;
-    char char_array[msg_len];
-    msg.toCharArray(char_array, msg_len);
-    return crc8((uint8_t *)char_array,msg.length());
+  return crc8_update(0, (const uint8_t *)msg.c_str(), msg.length());
+}
+
+// job line: lastblockhash,newblockhash,difficulty[,tagged fields][,crc8]
+// tagged fields start with a lowercase letter, unknown tags are skipped
+//   r<start>-<end> : nonce range to search, default 0-difficulty*100
+//   i<seq>         : queue mode, keep further jobs and tag the result
+bool parse_job(String line, duco_job &job) {
+  int field_start = 0;
+  int crc_start = -1;
+  uint8_t received_crc8 = 0;
+  uint8_t index = 0;
+  job.nonce_start = 0;
+  job.nonce_end = 0;
+  job.seq = -1;
+  while (field_start <= (int)line.length()) {
+    int field_end = line.indexOf(',', field_start);
+    if (field_end == -1) field_end = line.length();
+    String field = line.substring(field_start, field_end);
+    if (index == 0) job.lastblockhash = field;
+    else if (index == 1) job.newblockhash = field;
+    else if (index == 2) job.difficulty = field.toInt();
+    else if (field[0] == 'r') {
+      int dash = field.indexOf('-');
+      job.nonce_start = field.substring(1, dash).toInt();
+      if (dash != -1) job.nonce_end = field.substring(dash + 1).toInt();
+    }
+    else if (field[0] == 'i') job.seq = field.substring(1).toInt();
+    else if (CRC8_EN) {
+      // crc8 covers everything up to its own field
+      received_crc8 = field.toInt();
+      crc_start = field_start;
+    }
+    index++;
+    field_start = field_end + 1;
+  }
+  if (index < 3) return false;
+  if (CRC8_EN) {
+    if (crc_start == -1) return false;
+    if (calc_crc8(line.substring(0, crc_start)) != received_crc8) return false;
+  }
+  if (job.nonce_end == 0 || job.nonce_end > job.difficulty * 100) {
+    job.nonce_end = job.difficulty * 100;
+  }
+  return true;
+}
+
+// first byte of a FEC frame: '~' with at most one flipped bit
+bool fec_start(uint8_t c) {
+  uint8_t flipped = (c & 0x7f) ^ '~';
+  return (flipped & (flipped - 1)) == 0;
+}
+
+// FEC frame: ~<line>*<lrc>. Bit 7 of every character is even parity
+// and finds a flipped byte, lrc (XOR of the line, 2 hex digits) finds
+// the bit. Leaves the corrected plain line and returns the number of
+// corrected bits, -1 when it cannot be corrected
+int8_t fec_decode(String &line) {
+  if (line.length() < 4 || !fec_start(line[0])) return -1;
+  // by position, the '*' may be the flipped byte
+  int star = line.length() - 3;
+  int bad = -1;
+  uint8_t syndrome = 0;
+  for (int i = 1; i < star; i++) {
+    uint8_t c = line[i];
+    if (__builtin_parity(c)) {
+      if (bad != -1) return -1;
+      bad = i;
+    }
+    syndrome ^= c & 0x7f;
+  }
+  int8_t corrected = 0;
+  if (bad != -1) {
+    // an error in the lrc itself does not matter, only read it here
+    char lrc[3] = {(char)(line[star + 1] & 0x7f), (char)(line[star + 2] & 0x7f), 0};
+    syndrome ^= strtol(lrc, NULL, 16);
+    if (syndrome & (syndrome - 1)) return -1;
+    line.setCharAt(bad, line[bad] ^ syndrome);
+    corrected = 1;
+  }
+  String plain;
+  plain.reserve(star);
+  for (int i = 1; i < star; i++) plain += (char)(line[i] & 0x7f);
+  line = plain;
+  return corrected;
+}
+
+String fec_encode(String line) {
+  uint8_t lrc = 0;
+  for (unsigned int i = 0; i < line.length(); i++) lrc ^= line[i];
+  char hex[3];
+  sprintf(hex, "%02x", lrc);
+  String frame = "~" + line + "*" + hex;
+  for (unsigned int i = 0; i < frame.length(); i++) {
+    if (__builtin_parity((uint8_t)frame[i])) frame.setCharAt(i, frame[i] | 0x80);
+  }
+  return frame;
 }
 
 String get_DUCOID() {
@@ -53,7 +53,8 @@
 #define SerialPrintln(x)
 #endif
 
-#define BUFFER_MAX 90
+#define BUFFER_MAX 104
+#define RESULT_MAX 56
 #define HASH_BUFFER_SIZE 20
 #define CHAR_END '\n'
 #define CHAR_DOT ','
@@ -64,13 +65,22 @@ static const char WK_NAME[] PROGMEM = WORKER_NAME;
 static const char UNKN[] PROGMEM = "unkn";
 static const char ONE[] PROGMEM = "1";
 static const char ZERO[] PROGMEM = "0";
+static const char OK[] PROGMEM = "ok";
 
 static byte address;
 static char buffer[BUFFER_MAX];
+// last result, sent again on set,xmit$
+static char last_result[RESULT_MAX];
+// i<seq> of the job line, echoed in its result
+static int16_t job_seq;
+// bits corrected in a FEC framed job line, -1 for a plain one
+static int8_t job_ecc;
 static uint8_t buffer_position;
 static uint8_t buffer_length;
 static bool working;
 static bool jobdone;
+// CHAR_END or '$' (set,abort$) received while a job is hashed
+static volatile char cancelled;
 static double temperature_filter;
 
 void(* resetFunc) (void) = 0;//declare reset function at address 0
@@ -139,6 +149,14 @@ void do_work()
       resetFunc();
     }
 
+    // an empty line only cancels, nothing to answer
+    if (buffer[0] == CHAR_END) {
+      buffer_position = 0;
+      buffer_length = 0;
+      working = false;
+      return;
+    }
+
     // worker related command
     if (buffer[0] == 'g') {
       // i2c_cmd
@@ -147,6 +165,10 @@ void do_work()
       //    get,[b]aton$
       //    get,[s]inglecore$
       //    get,[f]req$
+      //    get,[r]ange$
+      //    get,[a]bort$
+      //    get,[x]mit$
+      //    get,[e]cc$
       char f = buffer[4];
       switch (tolower(f)) {
         case 't': // temperature
@@ -170,6 +192,22 @@ void do_work()
           strcpy_P(buffer, WK_NAME);
           SerialPrint("WORKER: ");
           break;
+        case 'r': // nonce range field in job line
+          strcpy_P(buffer, ONE);
+          SerialPrint("RANGE: ");
+          break;
+        case 'a': // set,abort support
+          strcpy_P(buffer, ONE);
+          SerialPrint("ABORT: ");
+          break;
+        case 'x': // set,xmit support, i<seq> field in job line
+          strcpy_P(buffer, ONE);
+          SerialPrint("XMIT: ");
+          break;
+        case 'e': // FEC framed job lines and results
+          strcpy_P(buffer, ONE);
+          SerialPrint("ECC: ");
+          break;
         default:
           strcpy_P(buffer, UNKN);
           SerialPrint("command: ");
@@ -187,7 +225,20 @@ void do_work()
       return;
     }
     else if (buffer[0] == 's') {
-      // not used at the moment
+      // i2c_cmd
+      //    set,[a]bort$
+      //    set,[x]mit$
+      // no job can be in progress here, abort only acknowledges
+      char f = tolower(buffer[4]);
+      if (f == 'a') strcpy_P(buffer, OK);
+      else if (f == 'x') strcpy(buffer, last_result);
+      else strcpy_P(buffer, UNKN);
+      SerialPrintln(buffer);
+      buffer_position = 0;
+      buffer_length = strlen(buffer);
+      working = false;
+      jobdone = true;
+      return;
     }
 
     #if I2CS_FIND_ADDR
@@ -202,6 +253,16 @@ void do_work()
     }
     #endif
 
+    job_ecc = -1;
+    if (fec_start(buffer[0])) {
+      // corrected in place, work() rejects what cannot be
+      job_ecc = fec_decode(buffer, buffer_length - 1);
+      if (job_ecc < 0) {
+        buffer[0] = 0;
+        job_ecc = 0;
+      }
+    }
+
     do_job();
   }
   led_off();
@@ -210,19 +271,36 @@ void do_work()
 void do_job()
 {
   unsigned long startTime = millis();
-  int job = work();
+  long job = work();
   unsigned long endTime = millis();
   unsigned int elapsedTime = endTime - startTime;
-  if (job<5) elapsedTime = job*(1<<2);
+  if (job > 0 && job < 5) elapsedTime = job*(1<<2);
   
   memset(buffer, 0, sizeof(buffer));
+
+  if (cancelled) {
+    // the host has moved on, nobody reads this result
+    SerialPrintln("Job cancelled");
+    buffer_position = 0;
+    buffer_length = 0;
+    if (cancelled == '$') {
+      // acknowledge set,abort$
+      strcpy_P(buffer, OK);
+      buffer_length = strlen(buffer);
+      jobdone = true;
+    }
+    cancelled = 0;
+    working = false;
+    return;
+  }
+
   char cstr[16];
   
   // Job
-  if (job == 0)
+  if (job < 0)
     strcpy(cstr,"#"); // re-request job
   else
-    itoa(job, cstr, 10);
+    ltoa(job, cstr, 10);
   strcpy(buffer, cstr);
   buffer[strlen(buffer)] = CHAR_DOT;
 
@@ -240,6 +318,22 @@ void do_job()
     if (UniqueID8[i] < 16) strcpy(buffer + strlen(buffer), "0");
     strcpy(buffer + strlen(buffer), cstr);
   }
+
+  // Sequence
+  if (job_seq >= 0) {
+    buffer[strlen(buffer)] = CHAR_DOT;
+    buffer[strlen(buffer)] = 'i';
+    itoa(job_seq, cstr, 10);
+    strcpy(buffer + strlen(buffer), cstr);
+  }
+
+  // tell the host a bit of the job line was corrected
+  if (job_ecc > 0) {
+    buffer[strlen(buffer)] = CHAR_DOT;
+    buffer[strlen(buffer)] = 'e';
+    itoa(job_ecc, cstr, 10);
+    strcpy(buffer + strlen(buffer), cstr);
+  }
   
   #if CRC8_EN
   char gen_crc8[3];
@@ -250,7 +344,10 @@ void do_job()
   strcpy(buffer + strlen(buffer), gen_crc8);
   #endif
 
+  if (job_ecc >= 0) fec_encode(buffer);
+
   SerialPrintln(buffer);
+  strncpy(last_result, buffer, RESULT_MAX - 1);
 
   buffer_position = 0;
   buffer_length = strlen(buffer);
@@ -262,14 +359,22 @@ void do_job()
   #endif
 }
 
-int work()
+// job line: lastHash,newHash,diff[,tagged fields][,crc8]
+// tagged fields start with a lowercase letter, unknown tags are skipped
+//   r<start>-<end> : nonce range to search, default 0-diff*100
+//   i<seq>         : sequence number, echoed in the result
+// returns the nonce, 0 when not found, -1 on a corrupted job
+long work()
 {
+  job_seq = -1;
   
   #if CRC8_EN
-  char *delim_ptr = strchr(buffer, CHAR_DOT);
-  delim_ptr = strchr(delim_ptr+1, CHAR_DOT);
-  uint8_t job_length = strchr(delim_ptr+1, CHAR_DOT) - &buffer[0] + 1;
+  // crc8 covers everything up to the last separator
+  char *delim_ptr = strrchr(buffer, CHAR_DOT);
+  if (delim_ptr == NULL) return -1;
+  uint8_t job_length = delim_ptr - &buffer[0] + 1;
   uint8_t calc_crc8 = crc8((uint8_t *)buffer, job_length);
+  bool crc8_ok = false;
   #endif
 
   // tokenize
@@ -277,20 +382,40 @@ int work()
   char *lastHash = strtok(buffer, delim);
   char *newHash = strtok(NULL, delim);
   char *diff = strtok(NULL, delim);
+  if (diff == NULL) return -1;
+
+  unsigned long nonce_start = 0;
+  unsigned long nonce_end = 0;
+  char *field;
+  while ((field = strtok(NULL, delim)) != NULL) {
+    if (field[0] == 'r') {
+      char *dash = strchr(field, '-');
+      nonce_start = atol(field + 1);
+      if (dash != NULL) nonce_end = atol(dash + 1);
+    }
+    else if (field[0] == 'i') job_seq = atoi(field + 1);
+    #if CRC8_EN
+    else if (field[0] >= '0' && field[0] <= '9') {
+      crc8_ok = (calc_crc8 == atoi(field));
+    }
+    #endif
+  }
 
   // validate integrity
   #if CRC8_EN
-  char *rx_crc8 = strtok(NULL, delim);
-  if (calc_crc8 != atoi(rx_crc8)) {
+  if (!crc8_ok) {
     // data corrupted
     SerialPrintln("CRC8 mismatched. Abort..");
-    return 0;
+    return -1;
   }
   #endif
 
+  unsigned long max_nonce = atoi(diff) * 100UL;
+  if (nonce_end == 0 || nonce_end > max_nonce) nonce_end = max_nonce;
+
   buffer_length = 0;
   buffer_position = 0;
-  return work(lastHash, newHash, atoi(diff));
+  return work(lastHash, newHash, atoi(diff), nonce_start, nonce_end);
 }
 
 //#define HTOI(c) ((c<='9')?(c-'0'):((c<='F')?(c-'A'+10):((c<='f')?(c-'a'+10):(0))))
@@ -304,8 +429,68 @@ void HEX_TO_BYTE(char * address, char * hex, int len)
   for (uint8_t i = 0; i < len; i++) address[i] = TWO_HTOI(hex[2 * i], hex[2 * i + 1]);
 }
 
+// first byte of a FEC frame: '~' with at most one flipped bit
+bool fec_start(uint8_t c)
+{
+  uint8_t flipped = (c & 0x7f) ^ '~';
+  return (flipped & (flipped - 1)) == 0;
+}
+
+// FEC frame: ~<line>*<lrc>. Bit 7 of every character is even parity
+// and finds a flipped byte, lrc (XOR of the line, 2 hex digits) finds
+// the bit. Leaves the corrected plain line terminated by CHAR_END and
+// returns the number of corrected bits, -1 when it cannot be corrected
+int8_t fec_decode(char * frame, uint8_t len)
+{
+  if (len < 4 || !fec_start(frame[0])) return -1;
+  // by position, the '*' may be the flipped byte
+  uint8_t star = len - 3;
+  int16_t bad = -1;
+  uint8_t syndrome = 0;
+  for (uint8_t i = 1; i < star; i++) {
+    uint8_t c = frame[i];
+    if (__builtin_parity(c)) {
+      if (bad != -1) return -1;
+      bad = i;
+    }
+    syndrome ^= c & 0x7f;
+  }
+  int8_t corrected = 0;
+  if (bad != -1) {
+    // an error in the lrc itself does not matter, only read it here
+    syndrome ^= TWO_HTOI(frame[star + 1] & 0x7f, frame[star + 2] & 0x7f);
+    if (syndrome & (syndrome - 1)) return -1;
+    frame[bad] ^= syndrome;
+    corrected = 1;
+  }
+  for (uint8_t i = 1; i < star; i++) frame[i - 1] = frame[i] & 0x7f;
+  frame[star - 1] = CHAR_END;
+  frame[star] = 0;
+  return corrected;
+}
+
+void fec_encode(char * frame)
+{
+  static const char HEX_DIGITS[] = "0123456789abcdef";
+  uint8_t len = strlen(frame);
+  uint8_t lrc = 0;
+  for (uint8_t i = len; i > 0; i--) {
+    lrc ^= frame[i - 1];
+    frame[i] = frame[i - 1];
+  }
+  frame[0] = '~';
+  frame[len + 1] = '*';
+  frame[len + 2] = HEX_DIGITS[lrc >> 4];
+  frame[len + 3] = HEX_DIGITS[lrc & 0x0f];
+  frame[len + 4] = 0;
+  for (uint8_t i = 0; i < len + 4; i++) {
+    if (__builtin_parity((uint8_t)frame[i])) frame[i] |= 0x80;
+  }
+}
+
 // DUCO-S1A hasher
-uint32_t work(char * lastblockhash, char * newblockhash, int difficulty)
+uint32_t work(char * lastblockhash, char * newblockhash, int difficulty,
+              unsigned long nonce_start, unsigned long nonce_end)
 {
   if (difficulty > 655) return 0;
   HEX_TO_BYTE(newblockhash, newblockhash, HASH_BUFFER_SIZE);
@@ -313,7 +498,8 @@ uint32_t work(char * lastblockhash, char * newblockhash, int difficulty)
   duco_hash_init(&hash, lastblockhash);
 
   char nonceStr[10 + 1];
-  for (int nonce = 0; nonce < difficulty*100+1; nonce++) {
+  for (unsigned long nonce = nonce_start; nonce <= nonce_end; nonce++) {
+    if (cancelled) return 0;
     ultoa(nonce, nonceStr, 10);
 
     uint8_t const * hash_bytes = duco_hash_try_nonce(&hash, nonceStr);
@@ -351,8 +537,23 @@ void initialize_i2c(void) {
 
 void onReceiveJob(int howMany) {
   if (howMany == 0) return;
-  if (working) return;
-  if (jobdone) return;
+  if (working || jobdone) {
+    // a new line or set,abort$ supersedes the job being hashed
+    // or its unread result
+    char c = Wire.read();
+    if (c == CHAR_END || c == '$') {
+      if (working) cancelled = c;
+      else {
+        memset(buffer, 0, sizeof(buffer));
+        if (c == '$') strcpy_P(buffer, OK);
+        jobdone = (c == '$');
+        buffer_position = 0;
+        buffer_length = strlen(buffer);
+      }
+    }
+    while (Wire.available()) Wire.read();
+    return;
+  }
 
   for (int i=0; i < howMany; i++) {
     if (i == 0) {
@@ -361,6 +562,7 @@ void onReceiveJob(int howMany) {
       if (buffer_length == BUFFER_MAX) buffer_length--;
       if ((c == CHAR_END) || (c == '$'))
       {
+        cancelled = 0;
         working = true;
       }
     }
@@ -476,19 +678,30 @@ byte getTrueRotateRandomByte() {
 
 #if CRC8_EN
 // https://stackoverflow.com/questions/51731313/cross-platform-crc8-function-c-and-python-parity-check
+// table driven version of the bitwise Dallas/Maxim CRC8 (reflected 0x8C)
+static const uint8_t crc8_table[256] PROGMEM = {
+  0x00, 0x5E, 0xBC, 0xE2, 0x61, 0x3F, 0xDD, 0x83, 0xC2, 0x9C, 0x7E, 0x20, 0xA3, 0xFD, 0x1F, 0x41,
+  0x9D, 0xC3, 0x21, 0x7F, 0xFC, 0xA2, 0x40, 0x1E, 0x5F, 0x01, 0xE3, 0xBD, 0x3E, 0x60, 0x82, 0xDC,
+  0x23, 0x7D, 0x9F, 0xC1, 0x42, 0x1C, 0xFE, 0xA0, 0xE1, 0xBF, 0x5D, 0x03, 0x80, 0xDE, 0x3C, 0x62,
+  0xBE, 0xE0, 0x02, 0x5C, 0xDF, 0x81, 0x63, 0x3D, 0x7C, 0x22, 0xC0, 0x9E, 0x1D, 0x43, 0xA1, 0xFF,
+  0x46, 0x18, 0xFA, 0xA4, 0x27, 0x79, 0x9B, 0xC5, 0x84, 0xDA, 0x38, 0x66, 0xE5, 0xBB, 0x59, 0x07,
+  0xDB, 0x85, 0x67, 0x39, 0xBA, 0xE4, 0x06, 0x58, 0x19, 0x47, 0xA5, 0xFB, 0x78, 0x26, 0xC4, 0x9A,
+  0x65, 0x3B, 0xD9, 0x87, 0x04, 0x5A, 0xB8, 0xE6, 0xA7, 0xF9, 0x1B, 0x45, 0xC6, 0x98, 0x7A, 0x24,
+  0xF8, 0xA6, 0x44, 0x1A, 0x99, 0xC7, 0x25, 0x7B, 0x3A, 0x64, 0x86, 0xD8, 0x5B, 0x05, 0xE7, 0xB9,
+  0x8C, 0xD2, 0x30, 0x6E, 0xED, 0xB3, 0x51, 0x0F, 0x4E, 0x10, 0xF2, 0xAC, 0x2F, 0x71, 0x93, 0xCD,
+  0x11, 0x4F, 0xAD, 0xF3, 0x70, 0x2E, 0xCC, 0x92, 0xD3, 0x8D, 0x6F, 0x31, 0xB2, 0xEC, 0x0E, 0x50,
+  0xAF, 0xF1, 0x13, 0x4D, 0xCE, 0x90, 0x72, 0x2C, 0x6D, 0x33, 0xD1, 0x8F, 0x0C, 0x52, 0xB0, 0xEE,
+  0x32, 0x6C, 0x8E, 0xD0, 0x53, 0x0D, 0xEF, 0xB1, 0xF0, 0xAE, 0x4C, 0x12, 0x91, 0xCF, 0x2D, 0x73,
+  0xCA, 0x94, 0x76, 0x28, 0xAB, 0xF5, 0x17, 0x49, 0x08, 0x56, 0xB4, 0xEA, 0x69, 0x37, 0xD5, 0x8B,
+  0x57, 0x09, 0xEB, 0xB5, 0x36, 0x68, 0x8A, 0xD4, 0x95, 0xCB, 0x29, 0x77, 0xF4, 0xAA, 0x48, 0x16,
+  0xE9, 0xB7, 0x55, 0x0B, 0x88, 0xD6, 0x34, 0x6A, 0x2B, 0x75, 0x97, 0xC9, 0x4A, 0x14, 0xF6, 0xA8,
+  0x74, 0x2A, 0xC8, 0x96, 0x15, 0x4B, 0xA9, 0xF7, 0xB6, 0xE8, 0x0A, 0x54, 0xD7, 0x89, 0x6B, 0x35
+};
+
 uint8_t crc8( uint8_t *addr, uint8_t len) {
-      uint8_t crc=0;
-      for (uint8_t i=0; i<len;i++) {
-         uint8_t inbyte = addr[i];
-         for (uint8_t j=0;j<8;j++) {
-             uint8_t mix = (crc ^ inbyte) & 0x01;
-             crc >>= 1;
-             if (mix) 
-                crc ^= 0x8C;
-         inbyte >>= 1;
-      }
-    }
-   return crc;
+  uint8_t crc = 0;
+  while (len--) crc = pgm_read_byte(&crc8_table[crc ^ *addr++]);
+  return crc;
 }
 #endif
 